@@ -0,0 +1,114 @@
+"""품목 간 가격 동조성(상관) 분석.
+
+일별 평균가격을 (날짜 × 시계열) 행렬 하나로 만든 뒤, 결측을 마스크로 두고
+행렬곱 몇 번으로 모든 쌍의 상관계수를 한꺼번에 구한다 (쌍마다 반복하지 않음).
+"""
+import numpy as np
+import pandas as pd
+
+from analytics.schema import DATE_COL, PRICE_COL
+
+# 시계열을 나누는 단위 → 묶는 컬럼
+SERIES_LEVELS = {
+    "품목": ["품목명"],
+    "품목·품종·등급": ["품목명", "품종명", "산물등급명"],
+}
+
+COMOVEMENT_COLUMNS = [DATE_COL, "조사구분명", "품목명", "품종명", "산물등급명", PRICE_COL]
+
+
+def daily_price_matrix(df, level="품목"):
+    keys = SERIES_LEVELS[level]
+    daily = df.groupby([DATE_COL] + keys)[PRICE_COL].mean()
+    matrix = daily.unstack(keys)
+    if len(keys) > 1:
+        matrix.columns = ["·".join(col) for col in matrix.columns]
+    matrix.columns.name = None
+    return matrix.sort_index()
+
+
+def to_returns(matrix):
+    # 일간 로그 변화율 (가격 수준의 추세로 생기는 허위 상관 제거)
+    return np.log(matrix).diff().iloc[1:]
+
+
+def correlation_matrix(matrix, min_periods=30):
+    """결측을 쌍별로 제외한 피어슨 상관계수 행렬 (행렬곱으로 일괄 계산)."""
+    matrix = matrix.dropna(axis=1, how="all")
+    x = matrix.to_numpy(dtype="float64")
+    mask = (~np.isnan(x)).astype("float64")
+    # 열 평균을 빼 두면 가격 수준 그대로 넣어도 제곱합 계산의 자릿수 손실이 줄어듦
+    x = np.nan_to_num(x - np.nanmean(x, axis=0))
+
+    n = mask.T @ mask                 # 두 시계열이 함께 관측된 날 수
+    sx = x.T @ mask                   # sx[i, j] = j가 관측된 날의 i 합
+    sxx = (x * x).T @ mask
+    sxy = x.T @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sxy - sx * sx.T
+        var = (n * sxx - sx * sx) * (n * sxx - sx * sx).T
+        corr = cov / np.sqrt(var)
+    corr[n < min_periods] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    return pd.DataFrame(corr, index=matrix.columns, columns=matrix.columns)
+
+
+def _components(w):
+    # 가중치 > 0 간선으로 이어진 연결 요소들 (큰 것부터)
+    unseen = set(range(len(w)))
+    components = []
+    while unseen:
+        stack = [unseen.pop()]
+        component = []
+        while stack:
+            i = stack.pop()
+            component.append(i)
+            neighbours = [j for j in np.flatnonzero(w[i] > 0) if j in unseen]
+            unseen.difference_update(neighbours)
+            stack.extend(neighbours)
+        components.append(sorted(component))
+    return sorted(components, key=len, reverse=True)
+
+
+def _fiedler_order(w):
+    if len(w) < 3:
+        return list(range(len(w)))
+    laplacian = np.diag(w.sum(axis=1)) - w
+    _, vectors = np.linalg.eigh(laplacian)
+    return list(np.argsort(vectors[:, 1], kind="stable"))
+
+
+def cluster_order(corr):
+    """비슷하게 움직이는 시계열끼리 붙도록 정렬한 순서 (스펙트럴 정렬).
+
+    유사도 max(ρ, 0)² 그래프 라플라시안의 두 번째 고유벡터(Fiedler 벡터) 순으로 정렬한다.
+    상관이 없거나(NaN, 함께 관측된 날 부족) 음수인 쌍은 간선이 없으므로, 그래프가
+    여러 덩어리로 나뉘면 Fiedler 벡터가 덩어리를 가르는 데만 쓰여 순서가 의미를 잃는다.
+    그래서 연결 요소마다 따로 정렬해 큰 요소부터 잇고, 고립된 시계열은 맨 뒤에 둔다.
+    """
+    labels = list(corr.index)
+    w = np.nan_to_num(np.clip(corr.to_numpy(), 0.0, None) ** 2)
+    np.fill_diagonal(w, 0.0)
+
+    order = []
+    for component in _components(w):
+        sub = w[np.ix_(component, component)]
+        order.extend(component[i] for i in _fiedler_order(sub))
+    return [labels[i] for i in order]
+
+
+def top_pairs(corr, n=20):
+    values = corr.to_numpy()
+    i, j = np.triu_indices(len(values), k=1)
+    pairs = pd.DataFrame({
+        "시계열 A": corr.index[i],
+        "시계열 B": corr.columns[j],
+        "상관계수": values[i, j],
+    }).dropna()
+    return pairs.sort_values("상관계수", ascending=False, ignore_index=True).head(n)
+
+
+def rolling_correlation(matrix, a, b, window, min_periods=None):
+    min_periods = window // 2 if min_periods is None else min_periods
+    return matrix[a].rolling(window, min_periods=min_periods).corr(matrix[b])
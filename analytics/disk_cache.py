@@ -0,0 +1,188 @@
+"""서버 재시작 후에도 남는 디스크 결과 캐시.
+
+st.cache_data는 메모리에만 있어 배포·재시작 때마다 비워진다. 이 캐시는 결과를
+`<캐시 폴더>/<데이터 파일 지문>/<함수>-<코드 해시>-<인자 해시>.parquet|.pkl` 로
+저장하고, 데이터 파일 내용이 바뀌면(지문이 달라지면) 예전 지문 폴더를 통째로 지운다.
+코드 해시는 analytics 패키지 전체 소스를 포함하므로, 계산 함수가 부르는 코드가
+바뀌어도 새 키가 된다. 쓰지 않는 항목은 크기(MAX_BYTES)·기간(MAX_AGE) 한도로 정리한다.
+
+    @st.cache_data      # 1차: 세션 간 메모리 캐시
+    @disk_cache         # 2차: 재시작 후에도 남는 디스크 캐시
+    def load_something(kind, start, end):
+        ...
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+from analytics.schema import DATA_PATH
+
+CACHE_DIR = os.environ.get("AGRI_CACHE_DIR", ".cache/results")
+MAX_BYTES = int(float(os.environ.get("AGRI_CACHE_MAX_MB", 512)) * 2**20)
+MAX_AGE = float(os.environ.get("AGRI_CACHE_MAX_DAYS", 30)) * 86400
+
+_fingerprints = {}
+_lock = threading.Lock()
+
+
+# --------------------------
+#  데이터 파일 지문
+# --------------------------
+def file_fingerprint(path=DATA_PATH):
+    # 내용 해시는 비싸므로 (경로, 수정시각, 크기)가 같으면 이전 값을 재사용
+    stat = os.stat(path)
+    stat_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        if stat_key in _fingerprints:
+            return _fingerprints[stat_key]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    fingerprint = digest.hexdigest()
+
+    with _lock:
+        _fingerprints[stat_key] = fingerprint
+    return fingerprint
+
+
+def _fingerprint_dir(fingerprint, cache_dir):
+    path = os.path.join(cache_dir, fingerprint)
+    if not os.path.isdir(path):
+        # 지문이 바뀌었다 = 데이터 파일이 바뀌었다 → 예전 결과는 모두 폐기
+        if os.path.isdir(cache_dir):
+            for name in os.listdir(cache_dir):
+                shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+# --------------------------
+#  저장 / 읽기
+# --------------------------
+def _read(base):
+    if os.path.exists(base + ".parquet"):
+        path = base + ".parquet"
+        value = pd.read_parquet(path)
+    else:
+        path = base + ".pkl"
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    # 최근에 쓴 항목이 정리 대상에서 뒤로 밀리도록 수정시각을 갱신
+    os.utime(path)
+    return value
+
+
+def _write(base, value):
+    # 임시 파일에 쓴 뒤 교체해서, 동시에 읽는 세션이 반쯤 쓴 파일을 보지 않게 함
+    if isinstance(value, pd.DataFrame):
+        path = base + ".parquet"
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        value.to_parquet(tmp)
+    else:
+        path = base + ".pkl"
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _prune(directory, max_bytes=None, max_age=None):
+    # 오래된 항목을 지우고, 그래도 한도를 넘으면 가장 오래 안 쓴 것부터 지움
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    max_age = MAX_AGE if max_age is None else max_age
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".tmp"):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+# --------------------------
+#  키
+# --------------------------
+def _code_version():
+    # analytics 패키지 소스 전체의 해시 (계산 함수가 부르는 코드가 바뀌어도 키가 달라짐)
+    digest = hashlib.blake2b(digest_size=8)
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(package_dir, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+CODE_VERSION = _code_version()
+
+
+def _function_id(func):
+    # 함수 자신의 소스(analytics 밖에 정의된 함수 대비) + 패키지 코드 해시
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = ""
+    key = f"{func.__module__}.{func.__qualname__}\n{source}\n{CODE_VERSION}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8)
+    return f"{func.__name__}-{digest.hexdigest()}"
+
+
+def disk_cache(func=None, *, data_path=DATA_PATH, cache_dir=None):
+    """데이터 파일 지문 + 함수 인자를 키로 결과를 디스크에 저장하는 데코레이터."""
+    if func is None:
+        return functools.partial(disk_cache, data_path=data_path, cache_dir=cache_dir)
+
+    signature = inspect.signature(func)
+    function_id = _function_id(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = repr(sorted(bound.arguments.items()))
+        key = hashlib.blake2b(params.encode(), digest_size=16).hexdigest()
+
+        root = cache_dir or CACHE_DIR
+        try:
+            base = os.path.join(_fingerprint_dir(file_fingerprint(data_path), root), f"{function_id}-{key}")
+        except OSError:
+            return func(*args, **kwargs)
+
+        try:
+            return _read(base)
+        except Exception:
+            # 없거나 깨진 캐시 파일이면 다시 계산해서 덮어씀
+            pass
+
+        value = func(*args, **kwargs)
+        try:
+            _write(base, value)
+            _prune(os.path.dirname(base))
+        except Exception:
+            # 읽기 전용 환경이거나 저장할 수 없는 값이면 디스크 캐시 없이 동작
+            pass
+        return value
+
+    return wrapper
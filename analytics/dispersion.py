@@ -0,0 +1,62 @@
+"""시장·지역 간 가격 분산(격차) 계산.
+
+전체 품목/품종/등급/조사구분에 대해 하루 단위로 한 번의 groupby로
+최고가·최저가·격차(max−min)·변동계수와 최저가/최고가 시장(지역)을 구한다.
+"""
+import pandas as pd
+
+from analytics.schema import DATE_COL, PRICE_COL
+
+SERIES_KEY = ["품목명", "품종명", "산물등급명", "조사구분명"]
+
+# 분산을 비교하는 단위 → 화면 표시용 이름
+LEVELS = {"시장명": "시장", "시도명": "지역"}
+
+DISPERSION_COLUMNS = SERIES_KEY + [DATE_COL, "시장명", "시도명", PRICE_COL]
+
+
+def daily_dispersion(df, level="시장명"):
+    keys = SERIES_KEY + [DATE_COL]
+
+    # 같은 날 같은 시장(지역)에 여러 행이 있으면 평균 한 값으로
+    per_unit = df.groupby(keys + [level], sort=False)[PRICE_COL].mean().reset_index()
+
+    grouped = per_unit.groupby(keys)[PRICE_COL]
+    out = grouped.agg(최고가="max", 최저가="min", 평균가="mean", 표준편차="std", 비교수="size")
+    out["최저가_" + level] = per_unit[level].to_numpy()[grouped.idxmin().to_numpy()]
+    out["최고가_" + level] = per_unit[level].to_numpy()[grouped.idxmax().to_numpy()]
+    out = out.reset_index()
+
+    # 비교 대상이 하나뿐인 날은 격차가 의미 없으므로 제외
+    out = out[out["비교수"] >= 2]
+    out["격차"] = out["최고가"] - out["최저가"]
+    out["변동계수"] = out["표준편차"] / out["평균가"]
+    return out.reset_index(drop=True)
+
+
+def rank_dispersion(daily, level="시장명", start=None, end=None):
+    if start is not None:
+        daily = daily[daily[DATE_COL] >= pd.to_datetime(start)]
+    if end is not None:
+        daily = daily[daily[DATE_COL] <= pd.to_datetime(end)]
+    if daily.empty:
+        return pd.DataFrame()
+
+    ranking = daily.groupby(SERIES_KEY).agg(
+        평균격차=("격차", "mean"),
+        최대격차=("격차", "max"),
+        평균변동계수=("변동계수", "mean"),
+        관측일수=(DATE_COL, "size"),
+    )
+
+    # 기간 중 가장 자주 최저가/최고가였던 시장(지역)
+    for side in ["최저가", "최고가"]:
+        col = f"{side}_{level}"
+        counts = daily.groupby(SERIES_KEY)[col].value_counts()
+        ranking[f"주 {side} {LEVELS[level]}"] = (
+            counts.groupby(level=SERIES_KEY).head(1).reset_index(level=col)[col]
+        )
+
+    ranking = ranking.sort_values("평균변동계수", ascending=False).reset_index()
+    ranking.insert(0, "순위", range(1, len(ranking) + 1))
+    return ranking
@@ -0,0 +1,265 @@
+"""원천 가격 내보내기(CSV/Excel/Parquet)를 대시보드용 Parquet 한 개로 컴파일한다.
+
+    python -m analytics.ingest raw/*.csv raw/*.xlsx -o data/농수축산_분석가능품목_only_v2_with_kgprice.parquet
+
+- 파일을 청크 단위로 나눠 프로세스 풀에서 병렬로 파싱·검증한다.
+- 스키마(analytics.schema)를 강제하고 출하단위로부터 kg당가격을 계산한다.
+- 잘못된 행은 버리거나(--invalid drop), 검증오류 컬럼을 붙여 별도 파일
+  (--rejects, 기본 `<출력>.rejected.parquet`)에 모아 둔다(--invalid flag).
+  페이지들은 출력 파일을 그대로 믿으므로 출력에는 항상 검증을 통과한 행만 들어간다.
+- 품목 → 날짜 순으로 정렬하고, 품목 경계에 맞춘 row group + 통계로 저장한다.
+  (페이지들이 품목 단위로 읽으므로 필터 pushdown 시 필요한 row group만 읽힘)
+- 저장 후 종합 가격지수(analytics.price_index)에 새 날짜를 증분 반영한다.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from analytics.price_index import INDEX_PATH, update_price_index
+from analytics.schema import (
+    COLUMNS,
+    DATA_PATH,
+    DATE_COL,
+    DERIVED_COLUMNS,
+    PRICE_COL,
+    REQUIRED_COLUMNS,
+    ROW_KEY,
+    SORT_KEY,
+    UNIT_COLUMNS,
+    UNIT_TO_KG,
+)
+
+CHUNK_ROWS = 200_000
+ROW_GROUP_ROWS = 32_768
+ERROR_COL = "검증오류"
+
+ARROW_TYPES = {
+    "datetime": pa.timestamp("ms"),
+    "string": pa.string(),
+    "int64": pa.int64(),
+    "float64": pa.float64(),
+}
+
+
+# --------------------------
+#  청크 읽기
+# --------------------------
+def iter_chunks(path, chunk_rows=CHUNK_ROWS, encoding="utf-8-sig"):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".txt"):
+        yield from pd.read_csv(path, dtype=str, chunksize=chunk_rows, encoding=encoding)
+    elif ext in (".xlsx", ".xls"):
+        sheet = pd.read_excel(path, dtype=str)
+        for start in range(0, len(sheet), chunk_rows):
+            yield sheet.iloc[start:start + chunk_rows]
+    elif ext == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+
+
+def read_header(path, encoding="utf-8-sig"):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".txt"):
+        return list(pd.read_csv(path, dtype=str, nrows=0, encoding=encoding).columns)
+    elif ext in (".xlsx", ".xls"):
+        return list(pd.read_excel(path, dtype=str, nrows=0).columns)
+    elif ext == ".parquet":
+        return pq.read_schema(path).names
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+
+
+def check_headers(paths, encoding="utf-8-sig"):
+    # 필수 컬럼이 빠진 파일은 모든 행이 결측으로 버려져 빈 파일을 쓰게 되므로 파싱 전에 막음
+    for path in paths:
+        missing = [col for col in REQUIRED_COLUMNS if col not in read_header(path, encoding)]
+        if missing:
+            raise ValueError(f"{path}: 필수 컬럼이 없습니다: {', '.join(missing)}")
+
+
+# --------------------------
+#  청크 정제 (워커 프로세스에서 실행)
+# --------------------------
+def _coerce(chunk):
+    out = pd.DataFrame(index=chunk.index)
+    for col, kind in COLUMNS.items():
+        if col in DERIVED_COLUMNS:
+            continue
+        s = chunk[col] if col in chunk.columns else pd.Series(pd.NA, index=chunk.index, dtype="object")
+        if kind == "datetime":
+            out[col] = pd.to_datetime(s, errors="coerce")
+        elif kind == "string":
+            s = s.astype("string").str.strip()
+            out[col] = s.mask(s == "")
+        elif kind == "int64":
+            out[col] = pd.to_numeric(s, errors="coerce").astype("Int64")
+        else:
+            out[col] = pd.to_numeric(s, errors="coerce").astype("float64")
+    return out
+
+
+def _kg_price(df):
+    kind = df["조사구분명"]
+    size = np.select(
+        [kind.eq(k).to_numpy(dtype=bool) for k in UNIT_COLUMNS],
+        [df[size_col].to_numpy(dtype="float64", na_value=np.nan) for size_col, _ in UNIT_COLUMNS.values()],
+        default=np.nan,
+    )
+    unit = pd.Series(
+        np.select(
+            [kind.eq(k).to_numpy(dtype=bool) for k in UNIT_COLUMNS],
+            [df[unit_col].to_numpy(dtype=object, na_value=None) for _, unit_col in UNIT_COLUMNS.values()],
+            default=None,
+        ),
+        index=df.index,
+        dtype="string",
+    )
+    factor = unit.str.lower().map(UNIT_TO_KG).to_numpy(dtype="float64", na_value=np.nan)
+    price = df["품목가격"].to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return size * factor, price / (size * factor)
+
+
+def clean_chunk(chunk):
+    df = _coerce(chunk)
+    unit_kg, kg_price = _kg_price(df)
+
+    # 검증 규칙 (위에서부터 처음 걸린 사유 하나만 기록)
+    missing = df[list(REQUIRED_COLUMNS)].isna().any(axis=1).to_numpy()
+    unknown_kind = ~df["조사구분명"].isin(list(UNIT_COLUMNS)).to_numpy(dtype=bool)
+    bad_unit = ~(unit_kg > 0)
+    bad_price = ~(df["품목가격"].to_numpy(dtype="float64", na_value=np.nan) > 0)
+    bad_kg_price = ~np.isfinite(kg_price)
+    df[ERROR_COL] = pd.Series(
+        np.select(
+            [missing, unknown_kind, bad_unit, bad_price, bad_kg_price],
+            ["필수값 결측", "조사구분 불명", "출하단위 오류", "가격 오류", "kg당가격 계산 불가"],
+            default=None,
+        ),
+        index=df.index,
+        dtype="string",
+    )
+
+    df["연도"] = df[DATE_COL].dt.year.astype("Int64")
+    df[PRICE_COL] = kg_price
+    return df
+
+
+# --------------------------
+#  컴파일
+# --------------------------
+def rejects_path_for(out_path):
+    root, ext = os.path.splitext(out_path)
+    return f"{root}.rejected{ext or '.parquet'}"
+
+
+def compile_exports(paths, out_path=DATA_PATH, invalid="drop", workers=None,
+                    chunk_rows=CHUNK_ROWS, row_group_rows=ROW_GROUP_ROWS, encoding="utf-8-sig",
+                    rejects_path=None):
+    check_headers(paths, encoding)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(clean_chunk, chunk)
+            for path in paths
+            for chunk in iter_chunks(path, chunk_rows, encoding)
+        ]
+        parts = [f.result() for f in futures]
+
+    if not parts:
+        raise ValueError("입력 파일에 데이터가 없습니다.")
+    df = pd.concat(parts, ignore_index=True)
+    report = {"읽은 행": len(df)}
+
+    errors = df[ERROR_COL].value_counts()
+    for reason, n in errors.items():
+        report[f"오류: {reason}"] = int(n)
+    if df[ERROR_COL].notna().all():
+        # 기존 데이터 파일을 빈(또는 전부 오류인) 파일로 덮어쓰지 않도록 저장 전에 중단
+        raise ValueError("검증을 통과한 행이 없어 저장하지 않습니다. (" + ", ".join(
+            f"{reason} {n:,}행" for reason, n in errors.items()
+        ) + ")")
+    rejected = df[ERROR_COL].notna()
+    if invalid == "flag":
+        # 잘못된 행은 대시보드 데이터와 섞지 않고 따로 저장
+        rejects_path = rejects_path or rejects_path_for(out_path)
+        report["별도 저장한 오류 행"], _ = write_parquet(df[rejected], rejects_path, row_group_rows)
+    df = df[~rejected].drop(columns=ERROR_COL)
+
+    # 여러 내보내기에 같은 행이 겹치면 가장 나중에 적재된 행만 남김
+    before = len(df)
+    df = df.sort_values("ETL적재일시", kind="stable", na_position="first")
+    df = df.drop_duplicates(ROW_KEY, keep="last")
+    report["중복 제거"] = before - len(df)
+
+    df = df.sort_values(SORT_KEY, kind="stable", ignore_index=True)
+    report["저장한 행"], report["row group"] = write_parquet(df, out_path, row_group_rows)
+    return report
+
+
+def write_parquet(df, out_path, row_group_rows=ROW_GROUP_ROWS):
+    fields = [pa.field(col, ARROW_TYPES[kind]) for col, kind in COLUMNS.items()]
+    if ERROR_COL in df.columns:
+        fields.append(pa.field(ERROR_COL, pa.string()))
+    schema = pa.schema(fields)
+
+    # 임시 파일에 쓴 뒤 교체 (페이지가 읽는 도중 깨진 파일을 보지 않도록)
+    tmp_path = f"{out_path}.tmp"
+    with pq.ParquetWriter(tmp_path, schema, compression="zstd", use_dictionary=True,
+                          write_statistics=True) as writer:
+        # 품목마다 따로 써서 row group이 품목 경계를 넘지 않게 함
+        for _, part in df.groupby("품목명", sort=False, dropna=False):
+            table = pa.Table.from_pandas(part[schema.names], schema=schema, preserve_index=False)
+            writer.write_table(table, row_group_size=row_group_rows)
+    os.replace(tmp_path, out_path)
+    # 실제로 저장된 (행 수, row group 수)
+    metadata = pq.ParquetFile(out_path).metadata
+    return metadata.num_rows, metadata.num_row_groups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="원천 가격 내보내기를 대시보드용 Parquet으로 컴파일")
+    parser.add_argument("inputs", nargs="+", help="CSV / Excel / Parquet 파일")
+    parser.add_argument("-o", "--output", default=DATA_PATH)
+    parser.add_argument("--invalid", choices=["drop", "flag"], default="drop",
+                        help="잘못된 행을 버릴지(drop), 검증오류 컬럼을 붙여 별도 파일로 저장할지(flag)")
+    parser.add_argument("--rejects", help="--invalid flag일 때 오류 행 저장 위치 (기본: <출력>.rejected.parquet)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--row-group-rows", type=int, default=ROW_GROUP_ROWS)
+    parser.add_argument("--encoding", default="utf-8-sig", help="CSV 인코딩 (예: cp949)")
+    parser.add_argument("--index-output", default=INDEX_PATH, help="종합 가격지수 저장 위치")
+    parser.add_argument("--no-index", action="store_true", help="종합 가격지수를 갱신하지 않음")
+    args = parser.parse_args(argv)
+
+    try:
+        report = compile_exports(
+            args.inputs, args.output, invalid=args.invalid, workers=args.workers,
+            chunk_rows=args.chunk_rows, row_group_rows=args.row_group_rows, encoding=args.encoding,
+            rejects_path=args.rejects,
+        )
+    except (ValueError, ImportError) as exc:
+        # ImportError: Excel 입력인데 openpyxl / xlrd가 없을 때
+        print(f"오류: {exc}", file=sys.stderr)
+        return 1
+    for key, value in report.items():
+        print(f"{key}: {value:,}")
+
+    if not args.no_index:
+        try:
+            _, new_days = update_price_index(args.output, args.index_output)
+        except ValueError as exc:
+            print(f"오류: 가격지수를 갱신하지 못했습니다: {exc}", file=sys.stderr)
+            return 1
+        print(f"가격지수 반영 날짜: {new_days:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
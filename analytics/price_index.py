@@ -0,0 +1,225 @@
+"""전체 품목 종합 가격지수 (고정 바스켓 상대가격 평균, 도매/소매 별도).
+
+    지수_t = 100 × Σ w_i · (p_i,t / p_i,기준) / Σ w_i
+
+p_i,t 는 품목 i 의 일별 평균 kg당가격, p_i,기준 은 기준기간 평균이다. 가중치를
+따로 주지 않으면 모든 품목이 1인 단순 평균(카를리 방식)이고, --weights로
+기준기간 지출 비중을 주면 라스파이레스 방식이 된다.
+
+바스켓(기준가격이 있는 품목)과 가중치는 고정이다. 어떤 날 관측되지 않은 품목은
+마지막 상대가격을 이어 써서, 빠진 품목 때문에 구성이 바뀌어 지수가 튀지 않게 한다.
+그래서 새 데이터가 들어오면 마지막 저장일 직전까지의 품목별 상대가격에서 이어
+마지막 저장일(늦게 들어온 행 반영)과 새 날짜만 다시 계산해 붙이면 된다. 결과는 작은 Parquet(INDEX_PATH) 하나로 저장되고,
+메인 페이지는 이 파일만 읽는다.
+
+    python -m analytics.price_index                       # 새 날짜만 증분 반영
+    python -m analytics.price_index --base-start 2021-01-01 --base-end 2021-12-31
+    python -m analytics.price_index --rebuild             # 과거 데이터가 수정됐을 때
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from analytics.schema import DATA_PATH, DATE_COL, PRICE_COL
+
+INDEX_PATH = "data/price_index.parquet"
+INDEX_TYPES = ["도매", "소매"]
+INDEX_COLUMNS = [DATE_COL, "조사구분명", "품목명", PRICE_COL]
+INDEX_OUTPUT_COLUMNS = [DATE_COL, "조사구분명", "지수", "품목수"]
+METADATA_KEY = b"price_index"
+
+
+# --------------------------
+#  계산
+# --------------------------
+def daily_item_means(df):
+    df = df[df["조사구분명"].isin(INDEX_TYPES)]
+    return df.groupby(["조사구분명", "품목명", DATE_COL])[PRICE_COL].mean()
+
+
+def base_prices(means, base_start, base_end):
+    dates = means.index.get_level_values(DATE_COL)
+    in_base = (dates >= pd.to_datetime(base_start)) & (dates <= pd.to_datetime(base_end))
+    return means[in_base].groupby(level=["조사구분명", "품목명"]).mean()
+
+
+def compute_index(means, bases, weights=None, carried=None):
+    """(일별 지수, 마지막 날 직전까지의 품목별 상대가격)을 반환한다.
+
+    carried는 means 첫날 직전까지의 품목별 상대가격으로, 증분 계산 시 첫날부터
+    관측되지 않은 품목의 값을 이어 쓰는 데 쓴다. 돌려주는 상대가격은 다음 증분
+    계산이 마지막 날을 다시 계산할 때의 carried가 된다. 품목수는 그날 실제로
+    관측된 품목 수.
+    """
+    # 기준가격이 없는 품목(기준기간 이후 새로 생긴 품목)은 바스켓에서 제외
+    rel = (means / bases.reindex(means.droplevel(DATE_COL).index).to_numpy()).dropna()
+    # (날짜 × (조사구분, 품목)) 표로 펼쳐 바스켓 전체 품목을 열로 둠
+    wide = rel.unstack(["조사구분명", "품목명"]).reindex(columns=bases.index).sort_index()
+    observed = wide.notna()
+    if carried is not None and len(wide):
+        wide.iloc[0] = wide.iloc[0].fillna(carried.reindex(bases.index))
+    # 관측이 없는 날은 그 품목의 마지막 상대가격을 이어 씀 (바스켓 구성 고정)
+    filled = wide.ffill()
+
+    # 가중치를 지정하지 않은 품목은 1. 첫 관측 전인 품목만 합에서 빠짐
+    w = pd.Series([(weights or {}).get(item, 1.0) for _, item in bases.index], index=bases.index)
+    by_kind = lambda frame: frame.T.groupby(level="조사구분명").sum().T.stack()
+    index = pd.DataFrame({
+        "가중합": by_kind(filled.fillna(0.0) * w),
+        "가중치합": by_kind(filled.notna() * w),
+        "품목수": by_kind(observed.astype("int64")),
+    })
+    # 그 조사구분이 하루도 관측되지 않은 날은 지수를 만들지 않음
+    index = index[index["품목수"] > 0]
+    index["지수"] = 100 * index["가중합"] / index["가중치합"]
+    index = index[["지수", "품목수"]].reset_index()[INDEX_OUTPUT_COLUMNS]
+
+    if len(filled) > 1:
+        carry = filled.iloc[-2].dropna()
+    else:
+        carry = carried if carried is not None else pd.Series(dtype="float64")
+    return index, carry
+
+
+# --------------------------
+#  저장 / 읽기
+# --------------------------
+def read_index(index_path=INDEX_PATH):
+    """(지수, 메타데이터)를 반환한다. 이 모듈이 쓴 파일이 아니면 ValueError."""
+    table = pq.read_table(index_path)
+    metadata = table.schema.metadata or {}
+    missing = [col for col in INDEX_OUTPUT_COLUMNS if col not in table.column_names]
+    if METADATA_KEY not in metadata or missing:
+        raise ValueError(f"가격지수 파일 형식이 맞지 않습니다: {index_path} (--rebuild로 다시 만들어 주세요)")
+    meta = json.loads(metadata[METADATA_KEY])
+    return table.to_pandas(), meta
+
+
+def write_index(index, meta, index_path=INDEX_PATH):
+    table = pa.Table.from_pandas(index, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        METADATA_KEY: json.dumps(meta, ensure_ascii=False).encode(),
+    })
+    tmp_path = f"{index_path}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, index_path)
+
+
+def _series_from_meta(prices_by_kind):
+    return pd.Series(
+        {(kind, item): price for kind, prices in prices_by_kind.items() for item, price in prices.items()},
+        dtype="float64",
+    ).rename_axis(["조사구분명", "품목명"])
+
+
+def _series_to_meta(bases):
+    return {
+        kind: {item: float(price) for (_, item), price in group.items()}
+        for kind, group in bases.groupby(level="조사구분명")
+    }
+
+
+def update_price_index(data_path=DATA_PATH, index_path=INDEX_PATH,
+                       base_start=None, base_end=None, weights=None, rebuild=False):
+    """저장된 지수의 마지막 날부터 다시 계산해 반영한다. 기준기간·가중치가 바뀌었거나
+    rebuild면 전체 재계산.
+
+    (전체 지수, 새로 반영한 날짜 수)를 반환한다.
+    """
+    stored, meta = None, None
+    if os.path.exists(index_path):
+        try:
+            stored, meta = read_index(index_path)
+        except ValueError:
+            # 형식이 맞지 않는 파일은 rebuild일 때만 버리고 새로 만듦
+            if not rebuild:
+                raise
+
+    if meta is not None:
+        # 따로 지정하지 않은 설정은 저장된 지수의 설정을 그대로 사용
+        base_start = base_start or meta["base_start"]
+        base_end = base_end or meta["base_end"]
+        weights = meta["weights"] if weights is None else weights
+        # 이어 쓸 상대가격이 없는 예전 형식이면 이어 붙일 수 없으므로 전체 재계산
+        incremental = not rebuild and "carry_relatives" in meta and (base_start, base_end, weights) == (
+            meta["base_start"], meta["base_end"], meta["weights"]
+        )
+    else:
+        incremental = False
+
+    if incremental:
+        # 마지막 저장일도 다시 읽음 (그날 늦게 들어온 시장 보고를 반영)
+        last_day = stored[DATE_COL].max()
+        df = pd.read_parquet(data_path, columns=INDEX_COLUMNS, filters=[(DATE_COL, ">=", last_day)])
+        kept = stored[stored[DATE_COL] < last_day]
+        new, carry = compute_index(
+            daily_item_means(df), _series_from_meta(meta["base_prices"]), weights,
+            carried=_series_from_meta(meta["carry_relatives"]),
+        )
+        new_days = new.loc[new[DATE_COL] > last_day, DATE_COL].nunique()
+        if new_days == 0 and new.equals(stored[stored[DATE_COL] >= last_day].reset_index(drop=True)):
+            # 마지막 날도 그대로면 파일을 다시 쓰지 않음
+            return stored, 0
+        index = pd.concat([kept, new], ignore_index=True)
+        meta["carry_relatives"] = _series_to_meta(carry)
+    else:
+        means = daily_item_means(pd.read_parquet(data_path, columns=INDEX_COLUMNS))
+        if base_start is None:
+            # 기본 기준기간: 데이터 첫 해 1년
+            first = means.index.get_level_values(DATE_COL).min()
+            base_start, base_end = f"{first.year}-01-01", f"{first.year}-12-31"
+        bases = base_prices(means, base_start, base_end)
+        index, carry = compute_index(means, bases, weights)
+        new_days = index[DATE_COL].nunique()
+        meta = {
+            "base_start": str(base_start),
+            "base_end": str(base_end),
+            "weights": weights or {},
+            "base_prices": _series_to_meta(bases),
+            "carry_relatives": _series_to_meta(carry),
+        }
+
+    index = index.sort_values([DATE_COL, "조사구분명"], ignore_index=True)
+    write_index(index, meta, index_path)
+    return index, new_days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="종합 가격지수 증분 갱신")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("-o", "--output", default=INDEX_PATH)
+    parser.add_argument("--base-start", help="기준기간 시작 (YYYY-MM-DD)")
+    parser.add_argument("--base-end", help="기준기간 끝 (YYYY-MM-DD)")
+    parser.add_argument("--weights", help='품목별 가중치 JSON 파일 (예: {"양파": 2.0}), 없으면 동일 가중')
+    parser.add_argument("--rebuild", action="store_true", help="저장된 지수를 버리고 전체 재계산")
+    args = parser.parse_args(argv)
+
+    if bool(args.base_start) != bool(args.base_end):
+        parser.error("--base-start 와 --base-end 는 함께 지정해야 합니다.")
+
+    weights = None
+    if args.weights:
+        with open(args.weights, encoding="utf-8") as f:
+            weights = json.load(f)
+
+    try:
+        index, new_days = update_price_index(
+            args.data, args.output, base_start=args.base_start, base_end=args.base_end,
+            weights=weights, rebuild=args.rebuild,
+        )
+    except ValueError as exc:
+        print(f"오류: {exc}", file=sys.stderr)
+        return 1
+    print(f"새로 반영한 날짜: {new_days:,}")
+    print(f"저장된 지수: {index[DATE_COL].min():%Y-%m-%d} ~ {index[DATE_COL].max():%Y-%m-%d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
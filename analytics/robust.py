@@ -0,0 +1,87 @@
+"""이동 중앙값 / MAD(중앙절대편차) 기반 로버스트 이상탐지.
+
+평균±2σ 밴드는 급등락 값 자체에 끌려가므로, 이상치에 둔감한 중앙값과 MAD로
+밴드를 만든다. 중앙값은 pandas rolling().median() (C 구현, O(n log w))을 쓰고,
+MAD는 창을 sliding_window_view로 펼쳐 블록 단위로 한꺼번에 정렬해서 구한다
+(O(n·w log w)지만 numpy 안에서 벡터로 돈다). 결측을 건너뛰고 min_periods를
+지원하는 대신, 결측 없는 입력에서는 창 전체를 np.median 하는 단순 방식과 비슷한
+시간이 든다 (benchmarks/bench_robust.py).
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 정규분포에서 MAD / 평균절대편차를 표준편차 척도로 맞추는 상수
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+# 한 번에 펼치는 창 수 (메모리 = BLOCK_ROWS × window × 8바이트)
+BLOCK_ROWS = 65_536
+
+
+# --------------------------
+#  중앙값 / MAD
+# --------------------------
+def _abs_deviations(values, center, window):
+    # 위치 i의 창(values[i-window+1 : i+1])에서 center[i]까지의 절대편차를 블록 단위로,
+    # 행마다 오름차순 정렬해서 돌려줌 (결측은 각 행의 뒤쪽으로 감)
+    if len(values) == 0:
+        return
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = sliding_window_view(padded, window)
+    for start in range(0, len(values), BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        yield block, np.sort(np.abs(windows[block] - center[block, None]), axis=1)
+
+
+def rolling_median_mad(values, window, min_periods=None):
+    """길이 window 이동창의 중앙값과 MAD. 결측은 건너뛰고 min_periods 미만이면 NaN."""
+    values = np.asarray(values, dtype="float64")
+    min_periods = window if min_periods is None else min_periods
+    median = (
+        pd.Series(values)
+        .rolling(window, min_periods=max(min_periods, 1))
+        .median()
+        .to_numpy()
+    )
+    mad = np.full(len(values), np.nan)
+    for block, dev in _abs_deviations(values, median, window):
+        count = (~np.isnan(dev)).sum(axis=1)
+        lo = np.take_along_axis(dev, np.maximum(count - 1, 0)[:, None] // 2, axis=1)[:, 0]
+        hi = np.take_along_axis(dev, (count // 2)[:, None], axis=1)[:, 0]
+        mad[block] = (lo + hi) / 2
+    mad[np.isnan(median)] = np.nan
+    return median, mad
+
+
+def rolling_mean_abs_dev(values, center, window):
+    """이동창 안 값들의 center로부터의 평균절대편차."""
+    values = np.asarray(values, dtype="float64")
+    out = np.full(len(values), np.nan)
+    for block, dev in _abs_deviations(values, center, window):
+        count = (~np.isnan(dev)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[block] = np.nansum(dev, axis=1) / count
+    out[np.isnan(center)] = np.nan
+    return out
+
+
+def robust_bands(prices, window, k=3.0):
+    """중앙값 ± k·(1.4826·MAD) 밴드. 입력 인덱스를 유지한 DataFrame 반환.
+
+    같은 가격이 반복되는 구간에서는 MAD가 0이 되어 밴드가 중앙값에 붙으므로
+    평균절대편차로 척도를 대신하고, 그것마저 0(창 안 가격이 모두 같음)이면
+    밴드를 비워 두어 급등락으로 판정하지 않는다.
+    """
+    values = prices.to_numpy(dtype="float64")
+    median, mad = rolling_median_mad(values, window)
+    scaled = MAD_SCALE * mad
+    flat = scaled == 0
+    if flat.any():
+        mean_ad = MEAN_AD_SCALE * rolling_mean_abs_dev(values, median, window)
+        scaled = np.where(flat, mean_ad, scaled)
+    scaled[scaled == 0] = np.nan
+    return pd.DataFrame(
+        {"MA": median, "STD": scaled, "Upper": median + k * scaled, "Lower": median - k * scaled},
+        index=prices.index,
+    )
@@ -0,0 +1,66 @@
+# ==========================================
+# 가격 데이터 스키마 정의
+#  - ingest 단계에서 강제되고, 페이지들은 이 스키마를 신뢰한다
+# ==========================================
+DATA_PATH = "data/농수축산_분석가능품목_only_v2_with_kgprice.parquet"
+
+DATE_COL = "가격등록일자"
+PRICE_COL = "kg당가격"
+
+# 원천(raw) 내보내기 파일에 반드시 있어야 하는 컬럼과 타입
+REQUIRED_COLUMNS = {
+    "가격등록일자": "datetime",
+    "시장고유번호": "int64",
+    "시장코드": "int64",
+    "시장명": "string",
+    "시도코드": "int64",
+    "시도명": "string",
+    "시군구코드": "int64",
+    "시군구명": "string",
+    "품목코드": "float64",
+    "품목명": "string",
+    "품종코드": "float64",
+    "품종명": "string",
+    "도소매조사구분코드": "float64",
+    "조사구분명": "string",
+    "산물등급코드": "float64",
+    "산물등급명": "string",
+    "품목가격": "int64",
+    "도매출하단위크기": "float64",
+    "도매출하단위명": "string",
+    "소매출하단위크기": "float64",
+    "소매출하단위명": "string",
+}
+
+# 없어도 되는 컬럼 (없으면 결측으로 채움)
+OPTIONAL_COLUMNS = {
+    "산지출하단위크기": "float64",
+    "산지출하단위명": "string",
+    "친환경농산물출하단위크기": "float64",
+    "친환경농산물출하단위명": "string",
+    "할인가격여부": "string",
+    "ETL적재일시": "string",
+}
+
+# ingest 단계에서 계산해서 붙이는 컬럼
+DERIVED_COLUMNS = {
+    "연도": "int64",
+    PRICE_COL: "float64",
+}
+
+COLUMNS = {**REQUIRED_COLUMNS, **OPTIONAL_COLUMNS, **DERIVED_COLUMNS}
+
+# 조사구분별로 kg당가격 계산에 쓰는 출하단위 컬럼 (크기, 단위명)
+UNIT_COLUMNS = {
+    "도매": ("도매출하단위크기", "도매출하단위명"),
+    "소매": ("소매출하단위크기", "소매출하단위명"),
+    "친환경": ("친환경농산물출하단위크기", "친환경농산물출하단위명"),
+}
+
+UNIT_TO_KG = {"kg": 1.0, "g": 0.001}
+
+# 한 행을 식별하는 키 (중복 적재 시 최신 ETL적재일시만 남김)
+ROW_KEY = ["가격등록일자", "시장고유번호", "품목코드", "품종코드", "도소매조사구분코드", "산물등급코드"]
+
+# 페이지들이 품목 → 날짜 순으로 읽으므로 이 순서로 정렬해서 저장
+SORT_KEY = ["품목명", "가격등록일자", "품종명", "산물등급명", "조사구분명", "시장고유번호"]
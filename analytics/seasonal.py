@@ -0,0 +1,102 @@
+"""연도별 겹쳐보기(전년 대비)용 달력 정렬 인덱스.
+
+로드 시점에 한 번, 모든 시계열의 일별 평균가격을 (시계열, 연도, 연중 일자)
+3차원 배열에 채워 둔다. 품목이나 연도를 바꿀 때는 원본 행을 다시 groupby하지
+않고 배열을 잘라 쓰기만 한다.
+"""
+import warnings
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from analytics.schema import DATE_COL, PRICE_COL
+
+SEASONAL_KEY = ["품목명", "품종명", "산물등급명", "조사구분명"]
+SEASONAL_COLUMNS = SEASONAL_KEY + [DATE_COL, PRICE_COL]
+
+# 2월 29일까지 들어가는 윤년을 공통 x축으로 사용
+AXIS_YEAR = 2000
+DAYS = 366
+
+
+def _day_of_year(dates):
+    # 평년의 3월 1일 이후는 하루 밀어서, 같은 날짜가 항상 같은 칸에 오게 함
+    doy = dates.dt.dayofyear.to_numpy() - 1
+    shift = (~dates.dt.is_leap_year & (dates.dt.month > 2)).to_numpy()
+    return doy + shift
+
+
+class SeasonalIndex:
+    def __init__(self, df):
+        daily = df.groupby(SEASONAL_KEY + [DATE_COL])[PRICE_COL].mean().reset_index()
+        codes, uniques = pd.MultiIndex.from_frame(daily[SEASONAL_KEY]).factorize()
+        self.series = {key: i for i, key in enumerate(uniques)}
+
+        years = daily[DATE_COL].dt.year.to_numpy()
+        self.years = np.arange(years.min(), years.max() + 1)
+        self.values = np.full((len(uniques), len(self.years), DAYS), np.nan)
+        self.values[codes, years - self.years[0], _day_of_year(daily[DATE_COL])] = daily[PRICE_COL].to_numpy()
+
+        self.axis = pd.date_range(f"{AXIS_YEAR}-01-01", periods=DAYS)
+
+    def _slice(self, key, years=None):
+        block = self.values[self.series[key]]
+        if years is None:
+            return self.years, block
+        rows = np.searchsorted(self.years, years)
+        return self.years[rows], block[rows]
+
+    def years_of(self, key):
+        if key not in self.series:
+            return []
+        has_data = ~np.isnan(self.values[self.series[key]]).all(axis=1)
+        return self.years[has_data].tolist()
+
+    def overlay(self, key, years=None):
+        """연도별 일별 가격 (공통 날짜축 '일자' 기준) long 형식."""
+        years, block = self._slice(key, years)
+        frame = pd.DataFrame({
+            "연도": np.repeat(years, DAYS).astype(str),
+            "일자": np.tile(self.axis, len(years)),
+            PRICE_COL: block.ravel(),
+        })
+        return frame.dropna(subset=[PRICE_COL])
+
+    def band(self, key, years=None):
+        """선택 연도들의 연중 일자별 평균·최저·최고."""
+        _, block = self._slice(key, years)
+        with warnings.catch_warnings():
+            # 어느 해에도 값이 없는 날짜는 NaN으로 두고 경고는 무시
+            warnings.simplefilter("ignore", RuntimeWarning)
+            frame = pd.DataFrame({
+                "일자": self.axis,
+                "평균": np.nanmean(block, axis=0),
+                "최저": np.nanmin(block, axis=0),
+                "최고": np.nanmax(block, axis=0),
+            })
+        return frame.dropna(subset=["평균"])
+
+
+def overlay_chart(index, key, first_year, last_year, height=330):
+    """다년 평균선 + 최저~최고 범위 위에 연도별 가격을 겹쳐 그린 차트 (페이지 01, 03)."""
+    years = [y for y in index.years_of(key) if first_year <= y <= last_year]
+
+    band = index.band(key, years)
+    band_area = alt.Chart(band).mark_area(opacity=0.2, color="#CCCCCC").encode(
+        x=alt.X("일자:T", title="월-일", axis=alt.Axis(format="%m-%d")),
+        y=alt.Y("최저:Q", title="가격(원/kg)"),
+        y2="최고:Q"
+    )
+    avg_line = alt.Chart(band).mark_line(color="#FFFFFF", strokeDash=[4, 4]).encode(
+        x="일자:T",
+        y="평균:Q",
+        tooltip=[alt.Tooltip("일자:T", title="월-일", format="%m-%d"), alt.Tooltip("평균:Q", title="다년 평균", format=",.0f")]
+    )
+    year_lines = alt.Chart(index.overlay(key, years)).mark_line().encode(
+        x="일자:T",
+        y=f"{PRICE_COL}:Q",
+        color=alt.Color("연도:N", title="연도"),
+        tooltip=["연도", alt.Tooltip("일자:T", title="월-일", format="%m-%d"), alt.Tooltip(PRICE_COL, format=",.0f")]
+    )
+    return (band_area + avg_line + year_lines).properties(height=height)
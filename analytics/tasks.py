@@ -0,0 +1,168 @@
+"""페이지의 무거운 계산 작업 (analytics.workers 프로세스 풀에서 실행).
+
+프로세스 풀로 보내려면 pickle 가능한 모듈 수준 함수여야 하고, 큰 DataFrame을
+주고받지 않도록 인자는 작은 값(품목명, 기간 등)만 받아 워커 안에서 직접 읽는다.
+결과는 디스크 캐시에도 남으므로 재시작 후에는 워커가 파일만 읽어 돌려준다.
+"""
+import pandas as pd
+
+from analytics.comovement import (
+    COMOVEMENT_COLUMNS,
+    cluster_order,
+    correlation_matrix,
+    daily_price_matrix,
+    to_returns,
+)
+from analytics.disk_cache import disk_cache
+from analytics.dispersion import DISPERSION_COLUMNS, daily_dispersion
+from analytics.robust import robust_bands
+from analytics.schema import DATA_PATH, DATE_COL, PRICE_COL
+from analytics.seasonal import SEASONAL_COLUMNS, SeasonalIndex
+
+
+# 조회 기간 슬라이더 범위 (페이지 01, 02, 03)
+@disk_cache
+def date_range(item=None, kinds=None):
+    filters = []
+    if item is not None:
+        filters.append(("품목명", "==", item))
+    if kinds is not None:
+        filters.append(("조사구분명", "in", list(kinds)))
+    dates = pd.read_parquet(DATA_PATH, columns=[DATE_COL], filters=filters or None)[DATE_COL]
+    return dates.min(), dates.max()
+
+
+# 품목·기간 안에서 고를 수 있는 {품종: [등급, ...]} (페이지 01, 03 사이드바)
+@disk_cache
+def item_varieties(item, kinds, start, end):
+    df = pd.read_parquet(
+        DATA_PATH,
+        columns=["품종명", "산물등급명"],
+        filters=[
+            ("품목명", "==", item),
+            ("조사구분명", "in", list(kinds)),
+            (DATE_COL, ">=", pd.to_datetime(start)),
+            (DATE_COL, "<=", pd.to_datetime(end)),
+        ],
+    ).dropna()
+    return {
+        variety: sorted(grades.unique())
+        for variety, grades in df.groupby("품종명")["산물등급명"]
+    }
+
+
+# 선택 조건의 도·소매 원자료 + 일별 평균 (페이지 01)
+@disk_cache
+def price_overview(item, variety, grade, start, end):
+    sub = pd.read_parquet(
+        DATA_PATH,
+        columns=[DATE_COL, "조사구분명", PRICE_COL],
+        filters=[
+            ("품목명", "==", item),
+            ("조사구분명", "!=", "친환경"),
+            ("품종명", "==", variety),
+            ("산물등급명", "==", grade),
+            (DATE_COL, ">=", pd.to_datetime(start)),
+            (DATE_COL, "<=", pd.to_datetime(end)),
+        ],
+    )
+    grouped = sub.groupby([DATE_COL, "조사구분명"], as_index=False)[PRICE_COL].mean()
+    return sub, grouped
+
+
+# 선택 조건의 도·소매 원자료 + 지역·시장별 월별/일별 평균 (페이지 02 지역·시장 탭)
+@disk_cache
+def regional_prices(item, variety, grade, start, end):
+    sub = pd.read_parquet(
+        DATA_PATH,
+        columns=[DATE_COL, "조사구분명", "시도명", "시장명", PRICE_COL],
+        filters=[
+            ("품목명", "==", item),
+            ("조사구분명", "in", ["도매", "소매"]),
+            ("품종명", "==", variety),
+            ("산물등급명", "==", grade),
+            (DATE_COL, ">=", pd.to_datetime(start)),
+            (DATE_COL, "<=", pd.to_datetime(end)),
+        ],
+    )
+    sub["연월"] = sub[DATE_COL].dt.to_period("M").astype(str)
+
+    result = {"원자료": sub}
+    for level in ["시도명", "시장명"]:
+        result[f"{level}_월별"] = sub.groupby(["조사구분명", level, "연월"], as_index=False)[PRICE_COL].mean()
+        result[f"{level}_일별"] = sub.groupby(["조사구분명", DATE_COL, level], as_index=False)[PRICE_COL].mean()
+    return result
+
+
+# 전체 품목의 일별 시장·지역 간 분산 (페이지 02)
+@disk_cache
+def dispersion(level):
+    df = pd.read_parquet(
+        DATA_PATH,
+        columns=DISPERSION_COLUMNS,
+        filters=[("조사구분명", "in", ["도매", "소매"])],
+    )
+    return daily_dispersion(df, level)
+
+
+# 선택 조건별 밴드·급등락 판정 결과 (페이지 03)
+@disk_cache
+def anomalies(item, variety, grade, start, end, window, method):
+    sub = pd.read_parquet(
+        DATA_PATH,
+        filters=[
+            ("품목명", "==", item),
+            ("조사구분명", "==", "도매"),
+            ("품종명", "==", variety),
+            ("산물등급명", "==", grade),
+        ],
+    )
+    sub = sub[
+        (sub[DATE_COL] >= pd.to_datetime(start)) &
+        (sub[DATE_COL] <= pd.to_datetime(end))
+    ]
+    sub = sub.sort_values(DATE_COL)
+
+    if len(sub) < window:
+        return sub
+
+    if method == "평균 ± 2σ":
+        # 이동평균 + 볼린저밴드
+        sub["MA"] = sub[PRICE_COL].rolling(window).mean()
+        sub["STD"] = sub[PRICE_COL].rolling(window).std()
+        sub["Upper"] = sub["MA"] + 2 * sub["STD"]
+        sub["Lower"] = sub["MA"] - 2 * sub["STD"]
+    else:
+        # 이동 중앙값 ± 3·(1.4826·MAD)
+        sub = sub.join(robust_bands(sub[PRICE_COL], window))
+
+    sub["급등"] = sub[PRICE_COL] > sub["Upper"]
+    sub["급락"] = sub[PRICE_COL] < sub["Lower"]
+    return sub
+
+
+# (날짜 × 시계열) 일별 평균가격 행렬 (페이지 04)
+@disk_cache
+def price_matrix(kind, level):
+    df = pd.read_parquet(
+        DATA_PATH,
+        columns=COMOVEMENT_COLUMNS,
+        filters=[("조사구분명", "==", kind)],
+    )
+    return daily_price_matrix(df, level)
+
+
+# 조회 기간별 상관행렬 + 군집 정렬 순서 (페이지 04)
+@disk_cache
+def correlation(kind, level, basis, start, end):
+    matrix = price_matrix(kind, level).loc[pd.to_datetime(start):pd.to_datetime(end)]
+    if basis == "일간 변화율":
+        matrix = to_returns(matrix)
+    corr = correlation_matrix(matrix)
+    return corr, cluster_order(corr)
+
+
+# 연도별 겹쳐보기용 (시계열, 연도, 연중 일자) 배열 (페이지 01, 03)
+@disk_cache
+def seasonal_index():
+    return SeasonalIndex(pd.read_parquet(DATA_PATH, columns=SEASONAL_COLUMNS))
@@ -0,0 +1,147 @@
+"""세션 간에 공유하는 계산용 프로세스 풀 + 같은 요청 합치기(single-flight).
+
+Streamlit은 세션마다 스크립트 스레드를 따로 돌리므로, 여러 사용자가 같은 품목을
+동시에 열면 같은 groupby·rolling 계산을 각자 GIL을 두고 경쟁하며 반복한다.
+여기서는 무거운 계산을 서버 프로세스 하나에 하나뿐인 프로세스 풀로 보내고,
+
+- 같은 (함수, 인자) 요청이 이미 실행 중이면 새로 보내지 않고 그 결과를 함께 기다리고,
+- 동시에 대기·실행 중인 작업 수를 MAX_PENDING으로 제한하며 (넘치면 QUEUE_TIMEOUT
+  동안만 자리를 기다림),
+- 요청마다 COMPUTE_TIMEOUT 안에 결과가 오지 않으면 ComputeUnavailable을 던진다.
+
+풀로 보내는 함수는 pickle 가능한 모듈 수준 함수여야 한다 (analytics.tasks 참고).
+AGRI_WORKERS=0 이면 풀 없이 현재 스레드에서 바로 실행한다.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+MAX_WORKERS = int(os.environ.get("AGRI_WORKERS", min(4, os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get("AGRI_MAX_PENDING", MAX_WORKERS * 4))
+QUEUE_TIMEOUT = float(os.environ.get("AGRI_QUEUE_TIMEOUT", 5))
+COMPUTE_TIMEOUT = float(os.environ.get("AGRI_COMPUTE_TIMEOUT", 60))
+
+
+class ComputeUnavailable(RuntimeError):
+    """풀이 가득 찼거나 제한 시간 안에 결과가 오지 않음."""
+
+
+_lock = threading.Lock()
+_pool = None
+_in_flight = {}
+_slots = threading.BoundedSemaphore(max(MAX_PENDING, 1))
+_spawn_lock = threading.Lock()
+_worker_main = types.ModuleType("__main__")
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # 스크립트 스레드가 여럿 도는 서버 프로세스를 fork하면 락 상태가 복제되어
+            # 교착될 수 있으므로 spawn으로 새 인터프리터를 띄움
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool(broken):
+    global _pool
+    with _lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _pool_submit(pool, func, args, kwargs):
+    # spawn으로 뜨는 워커는 부모의 __main__ 파일을 다시 실행하는데, Streamlit에서는
+    # 그게 현재 페이지 스크립트라 워커 안에서 페이지 전체가 돌게 된다.
+    # 워커 프로세스가 만들어질 수 있는 submit 동안만 __main__을 빈 모듈로 바꿔 둠.
+    with _spawn_lock:
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = _worker_main
+        try:
+            return pool.submit(func, *args, **kwargs)
+        finally:
+            if sys.modules.get("__main__") is _worker_main:
+                sys.modules["__main__"] = main
+
+
+def _request_key(func, args, kwargs):
+    return (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+
+
+def _submit(func, args, kwargs):
+    # (작업을 받은 풀, Future)를 반환
+    # 자리가 날 때까지 잠깐만 기다림 (한 품목에 요청이 몰려도 CPU 사용량이 늘지 않게)
+    if not _slots.acquire(timeout=QUEUE_TIMEOUT):
+        raise ComputeUnavailable("계산 요청이 너무 많습니다.")
+    try:
+        pool = _get_pool()
+        try:
+            return pool, _pool_submit(pool, func, args, kwargs)
+        except BrokenProcessPool:
+            # 워커가 비정상 종료되어 풀이 망가졌으면 한 번 새로 만들어 다시 보냄
+            _reset_pool(pool)
+            pool = _get_pool()
+            return pool, _pool_submit(pool, func, args, kwargs)
+    except BaseException:
+        _slots.release()
+        raise
+
+
+def run(func, *args, timeout=None, **kwargs):
+    """func(*args, **kwargs)를 공유 풀에서 실행하고 결과를 반환한다.
+
+    같은 요청이 이미 실행 중이면 새로 보내지 않고 그 결과를 함께 기다린다.
+    인자는 키로 쓰이므로 해시 가능한 작은 값(문자열, 숫자, 날짜 등)이어야 한다.
+    """
+    if MAX_WORKERS <= 0:
+        return func(*args, **kwargs)
+
+    key = _request_key(func, args, kwargs)
+    with _lock:
+        shared = _in_flight.get(key)
+        owner = shared is None
+        if owner:
+            # 먼저 자리표(Future)를 등록해 두고, 뒤따르는 같은 요청은 이것을 기다림
+            shared = _in_flight[key] = Future()
+
+    if owner:
+        try:
+            pool, task = _submit(func, args, kwargs)
+        except BaseException as exc:
+            with _lock:
+                _in_flight.pop(key, None)
+            shared.set_exception(exc)
+            raise
+
+        def _done(f):
+            _slots.release()
+            with _lock:
+                _in_flight.pop(key, None)
+            if f.cancelled():
+                shared.set_exception(ComputeUnavailable("계산이 취소되었습니다."))
+            elif isinstance(f.exception(), BrokenProcessPool):
+                # 실행 중 워커가 죽음 → 다음 요청이 새 풀을 쓰도록 바로 교체하고 재시도 안내
+                _reset_pool(pool)
+                shared.set_exception(ComputeUnavailable("계산 프로세스가 비정상 종료되었습니다."))
+            elif f.exception() is not None:
+                shared.set_exception(f.exception())
+            else:
+                shared.set_result(f.result())
+
+        task.add_done_callback(_done)
+
+    try:
+        return shared.result(timeout=COMPUTE_TIMEOUT if timeout is None else timeout)
+    except FutureTimeoutError:
+        # 다른 세션이 같은 결과를 기다리고 있을 수 있으므로 작업 자체는 취소하지 않음
+        raise ComputeUnavailable("계산이 제한 시간 안에 끝나지 않았습니다.") from None
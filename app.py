@@ -1,5 +1,11 @@
+import os
+
 import streamlit as st
 import pandas as pd
+import altair as alt
+
+from analytics.disk_cache import disk_cache, file_fingerprint
+from analytics.price_index import INDEX_PATH, INDEX_TYPES, read_index
 
 # --------------------------
 #  페이지 기본 설정 (가장 윗줄에 있어야 함)
@@ -39,14 +45,17 @@ DATA_PATH = "data/농수축산_분석가능품목_only_v2_with_kgprice.parquet"
 #  데이터 로드
 # --------------------------
 @st.cache_data
-def load_items():
-    df = pd.read_parquet(DATA_PATH)
-    df = df[df["조사구분명"] != "친환경"].copy()  # 친환경 제외
+@disk_cache
+def load_items(data_version):
+    df = pd.read_parquet(DATA_PATH, columns=["품목명", "조사구분명"])
+    df = df[df["조사구분명"] != "친환경"]  # 친환경 제외
     items = sorted(df['품목명'].dropna().unique())
-    return df, items
+    return items
 
 try:
-    df, items = load_items()
+    # 데이터 파일 지문 – 메모리 캐시 키에 넣어 ingest로 파일이 바뀌면 새로 계산되게 함
+    data_version = file_fingerprint(DATA_PATH)
+    items = load_items(data_version)
 except Exception as e:
     st.error(f"데이터를 불러오는 중 오류가 발생했습니다: {e}")
     st.stop()
@@ -108,6 +117,51 @@ st.markdown("""
 
 st.markdown("---")
 
+# --------------------------
+#  종합 가격지수 (저장된 작은 지수 파일만 읽음)
+#  - 지수는 ingest / python -m analytics.price_index 가 오프라인으로 만든다
+# --------------------------
+@st.cache_data
+def load_price_index(mtime):
+    # mtime을 인자로 받아 지수 파일이 갱신되면 캐시도 새로 읽힘
+    return read_index(INDEX_PATH)
+
+price_index = None
+if not os.path.exists(INDEX_PATH):
+    st.info("종합 가격지수 파일이 없습니다. `python -m analytics.price_index` 로 먼저 만들어 주세요.")
+else:
+    try:
+        price_index, index_meta = load_price_index(os.path.getmtime(INDEX_PATH))
+    except (OSError, ValueError) as e:
+        st.warning(f"종합 가격지수를 불러오지 못했습니다: {e}")
+
+if price_index is not None and not price_index.empty:
+    st.markdown(f"###  종합 가격지수 (기준기간 {index_meta['base_start']} ~ {index_meta['base_end']} = 100)")
+
+    pivot_index = price_index.pivot(index="가격등록일자", columns="조사구분명", values="지수")
+    last_date = pivot_index.index.max()
+    month_ago = pivot_index.loc[:last_date - pd.Timedelta(days=30)]
+
+    idx_cols = st.columns([1, 1, 2])
+    for col, kind in zip(idx_cols, INDEX_TYPES):
+        if kind not in pivot_index.columns:
+            continue
+        latest = pivot_index[kind].dropna()
+        prev = month_ago[kind].dropna() if kind in month_ago.columns else latest.iloc[0:0]
+        delta = f"{latest.iloc[-1] - prev.iloc[-1]:+.1f} (30일 전 대비)" if not prev.empty else None
+        col.metric(f"{kind} 지수 ({latest.index[-1]:%Y-%m-%d})", f"{latest.iloc[-1]:.1f}", delta=delta, delta_color="inverse")
+
+    with idx_cols[2]:
+        index_chart = alt.Chart(price_index).mark_line().encode(
+            x=alt.X("가격등록일자:T", title=None),
+            y=alt.Y("지수:Q", title=None, scale=alt.Scale(zero=False)),
+            color=alt.Color("조사구분명:N", scale=alt.Scale(domain=['도매', '소매'], range=['#4FC3F7', '#FF5E00']), title="구분"),
+            tooltip=["가격등록일자:T", "조사구분명", alt.Tooltip("지수:Q", format=".1f"), "품목수"]
+        ).properties(height=160)
+        st.altair_chart(index_chart, use_container_width=True)
+
+    st.markdown("---")
+
 # 품목 선택 버튼 그리드
 cols = st.columns(4)  # 4열로 더 넓게 배치
 for idx, name in enumerate(items):
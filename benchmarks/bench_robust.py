@@ -0,0 +1,51 @@
+"""이동 중앙값/MAD 계산 시간: rolling_median_mad vs 창 전체 np.median.
+
+둘 다 결측 없는 입력에서 같은 값을 내며, rolling_median_mad만 결측·min_periods를 처리한다.
+
+    python -m benchmarks.bench_robust
+"""
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from analytics.robust import rolling_median_mad
+
+N = 200_000
+WINDOWS = [7, 14, 30]
+
+
+def _naive(values, window):
+    # 창 전체를 한 번에 펼쳐서 중앙값·MAD (메모리 N × window)
+    windows = sliding_window_view(values, window)
+    median = np.median(windows, axis=1)
+    mad = np.median(np.abs(windows - median[:, None]), axis=1)
+    return median, mad
+
+
+def _timeit(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    values = np.random.default_rng(0).lognormal(8, 0.3, N).round(-1)
+    print(f"{'window':>6} {'rolling_median_mad':>20} {'sliding_window_view':>20}")
+    for window in WINDOWS:
+        # 비교 전에 두 방식의 결과가 같은지 확인 (rolling_median_mad 앞쪽 window-1개는 NaN)
+        median, mad = rolling_median_mad(values, window)
+        expected_median, expected_mad = _naive(values, window)
+        assert np.allclose(median[window - 1:], expected_median)
+        assert np.allclose(mad[window - 1:], expected_mad)
+
+        ours = _timeit(rolling_median_mad, values, window)
+        naive = _timeit(_naive, values, window)
+        print(f"{window:>6} {ours:>19.3f}s {naive:>19.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
 
+from analytics import tasks
+from analytics.disk_cache import file_fingerprint
+from analytics.seasonal import overlay_chart
+from analytics.workers import ComputeUnavailable, run
+
 st.set_page_config(page_title="도·소매 가격 개요", layout="wide")
 # ==========================================
 # 🎨 [옵션 1] 고급 그라데이션 배경 적용 코드
@@ -69,17 +73,38 @@ if "selected_item" not in st.session_state or not st.session_state["selected_ite
 item = st.session_state["selected_item"]
 st.title(f" {item} 도·소매 가격 개요")
 
-DATA_PATH = "data/농수축산_분석가능품목_only_v2_with_kgprice.parquet"
+# 조회 기간 범위 / 품종·등급 목록 / 선택 조건 데이터 – 공유 워커 풀에서 품목 row group만 읽음
+@st.cache_data
+def load_date_range(data_version):
+    return run(tasks.date_range, kinds=("도매", "소매"))
+
+
+@st.cache_data
+def load_varieties(data_version, item, start, end):
+    return run(tasks.item_varieties, item, ("도매", "소매"), start, end)
+
+
+@st.cache_data
+def load_prices(data_version, item, variety, grade, start, end):
+    return run(tasks.price_overview, item, variety, grade, start, end)
+
+
+# 연도별 겹쳐보기용 (시계열, 연도, 연중 일자) 배열 – 로드 시 한 번만 만듦
+@st.cache_data
+def load_seasonal_index(data_version):
+    return run(tasks.seasonal_index)
+
+
 try:
-    df = pd.read_parquet(DATA_PATH)
-except:
+    # 데이터 파일 지문 – 메모리 캐시 키에 넣어 ingest로 파일이 바뀌면 새로 계산되게 함
+    data_version = file_fingerprint()
+    min_date, max_date = load_date_range(data_version)
+except FileNotFoundError:
     st.error("데이터 파일을 찾을 수 없습니다.")
     st.stop()
-
-df = df[df["조사구분명"] != "친환경"].copy()
-df["가격등록일자"] = pd.to_datetime(df["가격등록일자"], errors="coerce")
-df = df.dropna(subset=["가격등록일자", PRICE_COL])
-df[PRICE_COL] = pd.to_numeric(df[PRICE_COL], errors="coerce")
+except ComputeUnavailable:
+    st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+    st.stop()
 
 # --------------------------
 # 2. 사이드바(Sidebar) 필터 
@@ -88,41 +113,42 @@ with st.sidebar:
     st.header("분석 옵션 설정")
     
     # 기간 선택
-    min_date = df["가격등록일자"].min().date()
-    max_date = df["가격등록일자"].max().date()
-    
     selected_range = st.slider(
         " 조회 기간",
-        min_value=min_date,
-        max_value=max_date,
-        value=(min_date, max_date),
+        min_value=min_date.date(),
+        max_value=max_date.date(),
+        value=(min_date.date(), max_date.date()),
         format="YYYY-MM-DD"
     )
     
-    # 품목 데이터 필터링
-    df_period = df[
-        (df["가격등록일자"] >= pd.to_datetime(selected_range[0])) & 
-        (df["가격등록일자"] <= pd.to_datetime(selected_range[1])) &
-        (df["품목명"] == item)
-    ]
+    try:
+        varieties = load_varieties(data_version, item, selected_range[0], selected_range[1])
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
     
     # 품종/등급 선택
-    var_list = sorted(df_period["품종명"].dropna().unique())
+    var_list = list(varieties)
     selected_var = st.selectbox(" 품종 선택", var_list)
     
-    grade_list = sorted(df_period[df_period["품종명"] == selected_var]["산물등급명"].dropna().unique())
+    grade_list = varieties.get(selected_var, [])
     selected_grade = st.selectbox(" 등급 선택", grade_list)
 
-# 최종 필터링
-sub = df_period[(df_period["품종명"] == selected_var) & (df_period["산물등급명"] == selected_grade)].copy()
+if selected_var is None or selected_grade is None:
+    st.error("선택하신 조건에 해당하는 데이터가 없습니다.")
+    st.stop()
+
+# 최종 필터링 + 집계
+try:
+    sub, sub_grouped = load_prices(data_version, item, selected_var, selected_grade, selected_range[0], selected_range[1])
+except ComputeUnavailable:
+    st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+    st.stop()
 
 if sub.empty:
     st.error("선택하신 조건에 해당하는 데이터가 없습니다.")
     st.stop()
 
-# 집계 데이터 생성
-sub_grouped = sub.groupby(["가격등록일자", "조사구분명"], as_index=False)[PRICE_COL].mean()
-
 #  공통 색상 정의 (도매=파랑, 소매=주황)
 color_scale = alt.Scale(domain=['도매', '소매'], range=['#004B85', '#FF5E00'])
 
@@ -165,13 +191,29 @@ col1, col2 = st.columns([1.2, 0.8])
 
 with col1:
     st.subheader(" 일자별 가격 추이")
-    line_chart = alt.Chart(sub_grouped).mark_line().encode(
-        x=alt.X("가격등록일자:T", title="날짜", axis=alt.Axis(format="%y-%m-%d")),
-        y=alt.Y(f"{PRICE_COL}:Q", title="가격(원/kg)"),
-        color=alt.Color("조사구분명:N", scale=color_scale, title="구분"),
-        tooltip=["가격등록일자", "조사구분명", alt.Tooltip(PRICE_COL, format=",")]
-    ).properties(height=350)
-    st.altair_chart(line_chart, use_container_width=True)
+    view = st.radio("보기", ["전체 기간", "연도별 겹쳐보기"], horizontal=True, label_visibility="collapsed")
+
+    if view == "전체 기간":
+        line_chart = alt.Chart(sub_grouped).mark_line().encode(
+            x=alt.X("가격등록일자:T", title="날짜", axis=alt.Axis(format="%y-%m-%d")),
+            y=alt.Y(f"{PRICE_COL}:Q", title="가격(원/kg)"),
+            color=alt.Color("조사구분명:N", scale=color_scale, title="구분"),
+            tooltip=["가격등록일자", "조사구분명", alt.Tooltip(PRICE_COL, format=",")]
+        ).properties(height=350)
+        st.altair_chart(line_chart, use_container_width=True)
+
+    else:
+        try:
+            seasonal = load_seasonal_index(data_version)
+        except ComputeUnavailable:
+            st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+            st.stop()
+        yoy_type = st.radio("조사 기준", sorted(sub["조사구분명"].unique()), horizontal=True, key="yoy_type")
+
+        key = (item, selected_var, selected_grade, yoy_type)
+        # 다년 평균선 + 최저~최고 범위 위에 연도별 가격을 겹쳐 그림
+        chart = overlay_chart(seasonal, key, selected_range[0].year, selected_range[1].year, height=350)
+        st.altair_chart(chart, use_container_width=True)
 
 with col2:
     st.subheader(" 가격 분포 (Boxplot)")
@@ -2,6 +2,11 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 
+from analytics import tasks
+from analytics.disk_cache import file_fingerprint
+from analytics.dispersion import LEVELS, rank_dispersion
+from analytics.workers import ComputeUnavailable, run
+
 st.set_page_config(page_title="지역·시장 분석", layout="wide")
 
 # ==========================================
@@ -37,11 +42,27 @@ if "selected_item" not in st.session_state or not st.session_state["selected_ite
 item = st.session_state["selected_item"]
 st.title(f"{item} 지역 및 시장별 심층 분석")
 
-DATA_PATH = "data/농수축산_분석가능품목_only_v2_with_kgprice.parquet"
-df = pd.read_parquet(DATA_PATH)
+# 데이터 파일 지문 – 메모리 캐시 키에 넣어 ingest로 파일이 바뀌면 새로 계산되게 함
+data_version = file_fingerprint()
+
+# 품목의 조회 기간 범위 / 품종·등급 목록 / 지역·시장별 집계
+# (공유 워커 풀에서 품목 row group만 읽어 계산)
+@st.cache_data
+def load_date_range(data_version, item):
+    return run(tasks.date_range, item, ("도매", "소매"))
+
+@st.cache_data
+def load_varieties(data_version, item, start, end):
+    return run(tasks.item_varieties, item, ("도매", "소매"), start, end)
 
-df = df[(df["품목명"] == item) & (df["조사구분명"].isin(["도매", "소매"]))].copy()
-df["가격등록일자"] = pd.to_datetime(df["가격등록일자"])
+@st.cache_data
+def load_regional_prices(data_version, item, variety, grade, start, end):
+    return run(tasks.regional_prices, item, variety, grade, start, end)
+
+# 전체 품목의 일별 시장·지역 간 분산 (공유 워커 풀에서 한 번 계산 후 캐시)
+@st.cache_data
+def load_dispersion(data_version, level):
+    return run(tasks.dispersion, level)
 
 # ==========================================
 # 사이드바 필터
@@ -49,7 +70,11 @@ df["가격등록일자"] = pd.to_datetime(df["가격등록일자"])
 with st.sidebar:
     st.header("분석 옵션 설정")
     
-    min_d, max_d = df["가격등록일자"].min(), df["가격등록일자"].max()
+    try:
+        min_d, max_d = load_date_range(data_version, item)
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
     dates = st.slider(
         "조회 기간",
         min_value=min_d.date(),
@@ -57,21 +82,28 @@ with st.sidebar:
         value=(min_d.date(), max_d.date())
     )
     
-    filtered_date = df[
-        (df["가격등록일자"] >= pd.to_datetime(dates[0])) &
-        (df["가격등록일자"] <= pd.to_datetime(dates[1]))
-    ]
+    try:
+        varieties = load_varieties(data_version, item, dates[0], dates[1])
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
     
-    p_list = sorted(filtered_date["품종명"].dropna().unique())
+    p_list = list(varieties)
     sel_p = st.selectbox("품종", p_list)
     
-    g_list = sorted(filtered_date[filtered_date["품종명"] == sel_p]["산물등급명"].dropna().unique())
+    g_list = varieties.get(sel_p, [])
     sel_g = st.selectbox("등급", g_list)
-    
-    sub = filtered_date[
-        (filtered_date["품종명"] == sel_p) &
-        (filtered_date["산물등급명"] == sel_g)
-    ].copy()
+
+if sel_p is None or sel_g is None:
+    st.error("조건에 맞는 데이터가 없습니다.")
+    st.stop()
+
+try:
+    regional = load_regional_prices(data_version, item, sel_p, sel_g, dates[0], dates[1])
+except ComputeUnavailable:
+    st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+    st.stop()
+sub = regional["원자료"]
 
 if sub.empty:
     st.error("조건에 맞는 데이터가 없습니다.")
@@ -80,7 +112,7 @@ if sub.empty:
 # ==========================================
 # 탭 구성
 # ==========================================
-tab1, tab2 = st.tabs(["지역별 분석 (시도 단위)", "시장별 분석 (세부 시장)"])
+tab1, tab2, tab3 = st.tabs(["지역별 분석 (시도 단위)", "시장별 분석 (세부 시장)", "가격 격차 (시장·지역 간)"])
 
 # ==========================================
 # TAB 1: 지역 분석
@@ -101,10 +133,8 @@ with tab1:
     # -----------------------------------------------------
     # ② 히트맵 (전체 지역 기준)
     # -----------------------------------------------------
-    sub_region_whole = sub[sub["조사구분명"] == target_type].copy()
-    sub_region_whole["연월"] = sub_region_whole["가격등록일자"].dt.to_period("M").astype(str)
-
-    heat_data = sub_region_whole.groupby(["시도명", "연월"], as_index=False)[PRICE_COL].mean()
+    region_monthly = regional["시도명_월별"]
+    heat_data = region_monthly[region_monthly["조사구분명"] == target_type]
 
     heatmap = (
         alt.Chart(heat_data)
@@ -124,7 +154,7 @@ with tab1:
     # -----------------------------------------------------
     st.markdown("#### 지역별 비교 옵션")
 
-    regions = sorted(sub[sub["조사구분명"] == target_type]["시도명"].unique())
+    regions = sorted(heat_data["시도명"].unique())
 
     sel_regions = st.multiselect(
         "비교할 지역 선택",
@@ -135,13 +165,12 @@ with tab1:
     # -----------------------------------------------------
     # ④ 시계열 그래프 (지역 선택 아래)
     # -----------------------------------------------------
-    sub_r = sub[(sub["조사구분명"] == target_type) & (sub["시도명"].isin(sel_regions))]
+    region_daily = regional["시도명_일별"]
+    sub_r = region_daily[(region_daily["조사구분명"] == target_type) & (region_daily["시도명"].isin(sel_regions))]
 
     if not sub_r.empty:
         chart_r = (
-            alt.Chart(
-                sub_r.groupby(["가격등록일자", "시도명"], as_index=False)[PRICE_COL].mean()
-            )
+            alt.Chart(sub_r)
             .mark_line()
             .encode(
                 x="가격등록일자:T",
@@ -161,10 +190,8 @@ with tab2:
 
     m_type = st.radio("조사 기준", ["도매", "소매"], horizontal=True, key="t2_radio")
 
-    sub_m_whole = sub[sub["조사구분명"] == m_type].copy()
-    sub_m_whole["연월"] = sub_m_whole["가격등록일자"].dt.to_period("M").astype(str)
-
-    heat_m = sub_m_whole.groupby(["시장명", "연월"], as_index=False)[PRICE_COL].mean()
+    market_monthly = regional["시장명_월별"]
+    heat_m = market_monthly[market_monthly["조사구분명"] == m_type]
 
     heatmap2 = (
         alt.Chart(heat_m)
@@ -181,23 +208,23 @@ with tab2:
 
     st.markdown("#### 개별 시장 가격 분포")
 
-    markets = sorted(sub_m_whole["시장명"].unique())
+    markets = sorted(heat_m["시장명"].unique())
     sel_markets = st.multiselect(
         "비교할 시장 선택",
         markets,
         default=markets[:3] if len(markets) > 2 else markets
     )
 
-    sub_m = sub_m_whole[sub_m_whole["시장명"].isin(sel_markets)]
+    sub_m = sub[(sub["조사구분명"] == m_type) & (sub["시장명"].isin(sel_markets))]
+    market_daily = regional["시장명_일별"]
+    sub_m_daily = market_daily[(market_daily["조사구분명"] == m_type) & (market_daily["시장명"].isin(sel_markets))]
     
     if not sub_m.empty:
         c1, c2 = st.columns(2)
         
         with c1:
             m_line = (
-                alt.Chart(
-                    sub_m.groupby(["가격등록일자", "시장명"], as_index=False)[PRICE_COL].mean()
-                )
+                alt.Chart(sub_m_daily)
                 .mark_line()
                 .encode(
                     x="가격등록일자:T",
@@ -225,3 +252,92 @@ with tab2:
         st.info("비교할 시장을 선택해주세요.")
 
 
+# ==========================================
+# TAB 3: 시장·지역 간 가격 격차
+# ==========================================
+with tab3:
+    st.markdown("#### 일별 시장·지역 간 가격 격차")
+
+    c_level, c_type = st.columns(2)
+    with c_level:
+        d_level = st.radio(
+            "비교 단위", list(LEVELS), format_func=LEVELS.get, horizontal=True, key="t3_level"
+        )
+    with c_type:
+        d_type = st.radio("조사 기준", ["도매", "소매"], horizontal=True, key="t3_radio")
+
+    label = LEVELS[d_level]
+    try:
+        daily = load_dispersion(data_version, d_level)
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
+    daily = daily[
+        (daily["가격등록일자"] >= pd.to_datetime(dates[0])) &
+        (daily["가격등록일자"] <= pd.to_datetime(dates[1]))
+    ]
+
+    d_sub = daily[
+        (daily["품목명"] == item) &
+        (daily["품종명"] == sel_p) &
+        (daily["산물등급명"] == sel_g) &
+        (daily["조사구분명"] == d_type)
+    ]
+
+    if d_sub.empty:
+        st.info(f"비교할 {label}이 2곳 이상인 날이 없습니다.")
+    else:
+        last = d_sub.iloc[-1]
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("평균 격차 (최고−최저)", f"{d_sub['격차'].mean():,.0f}원/kg")
+        m2.metric("평균 변동계수", f"{d_sub['변동계수'].mean():.1%}")
+        m3.metric(f"최근 최저가 {label}", last[f"최저가_{d_level}"], f"{last['최저가']:,.0f}원/kg", delta_color="off")
+        m4.metric(f"최근 최고가 {label}", last[f"최고가_{d_level}"], f"{last['최고가']:,.0f}원/kg", delta_color="off")
+
+        spread_chart = (
+            alt.Chart(d_sub)
+            .mark_area(opacity=0.3, color="#4FC3F7")
+            .encode(
+                x=alt.X("가격등록일자:T", title="날짜"),
+                y=alt.Y("최저가:Q", title="가격(원/kg)"),
+                y2="최고가:Q",
+                tooltip=[
+                    "가격등록일자:T",
+                    alt.Tooltip("최저가:Q", format=","),
+                    alt.Tooltip(f"최저가_{d_level}:N", title=f"최저가 {label}"),
+                    alt.Tooltip("최고가:Q", format=","),
+                    alt.Tooltip(f"최고가_{d_level}:N", title=f"최고가 {label}"),
+                    alt.Tooltip("변동계수:Q", format=".1%"),
+                ]
+            )
+        )
+        mean_line = alt.Chart(d_sub).mark_line(color="#4FC3F7").encode(
+            x="가격등록일자:T", y="평균가:Q"
+        )
+        st.altair_chart(
+            (spread_chart + mean_line).properties(height=320, title=f"{label} 간 최저~최고 가격 범위"),
+            use_container_width=True
+        )
+
+    # -----------------------------------------------------
+    # 전체 품목 격차 순위
+    # -----------------------------------------------------
+    st.markdown(f"#### 전체 품목 {label} 간 가격 격차 순위")
+    st.caption("조회 기간 동안의 일평균 변동계수(표준편차/평균)가 큰 순서입니다.")
+
+    ranking = rank_dispersion(daily[daily["조사구분명"] == d_type], d_level)
+    if ranking.empty:
+        st.info("조회 기간에 해당하는 데이터가 없습니다.")
+    else:
+        st.dataframe(
+            ranking,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "평균격차": st.column_config.NumberColumn("평균 격차(원/kg)", format="%.0f"),
+                "최대격차": st.column_config.NumberColumn("최대 격차(원/kg)", format="%.0f"),
+                "평균변동계수": st.column_config.ProgressColumn(
+                    "평균 변동계수", format="%.3f", min_value=0.0, max_value=float(ranking["평균변동계수"].max())
+                ),
+            }
+        )
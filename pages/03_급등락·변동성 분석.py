@@ -1,7 +1,11 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
 
+from analytics import tasks
+from analytics.disk_cache import file_fingerprint
+from analytics.seasonal import overlay_chart
+from analytics.workers import ComputeUnavailable, run
+
 # =========================================================
 # 페이지 설정
 # =========================================================
@@ -70,11 +74,28 @@ st.title(f" {item} 가격 급등락(이상탐지) 분석")
 # =========================================================
 # 1. 데이터 로드
 # =========================================================
-DATA_PATH = "data/농수축산_분석가능품목_only_v2_with_kgprice.parquet"
-df = pd.read_parquet(DATA_PATH)
+# 조회 기간 범위 / 도매 품종·등급 목록 – 공유 워커 풀에서 품목 row group만 읽음
+@st.cache_data
+def load_date_range(data_version):
+    return run(tasks.date_range)
+
+
+@st.cache_data
+def load_varieties(data_version, item, start, end):
+    return run(tasks.item_varieties, item, ("도매",), start, end)
+
+
+# 선택 조건별 밴드·급등락 판정 결과 (공유 워커 풀에서 계산)
+@st.cache_data
+def detect_anomalies(data_version, item, variety, grade, start, end, window, method):
+    return run(tasks.anomalies, item, variety, grade, start, end, window, method)
+
+
+# 연도별 겹쳐보기용 (시계열, 연도, 연중 일자) 배열 – 로드 시 한 번만 만듦
+@st.cache_data
+def load_seasonal_index(data_version):
+    return run(tasks.seasonal_index)
 
-df["가격등록일자"] = pd.to_datetime(df["가격등록일자"])
-df[PRICE_COL] = pd.to_numeric(df[PRICE_COL], errors="coerce")
 
 # =========================================================
 # 2. Sidebar 옵션
@@ -82,54 +103,58 @@ df[PRICE_COL] = pd.to_numeric(df[PRICE_COL], errors="coerce")
 with st.sidebar:
     st.header(" 분석 옵션")
 
-    min_date = df["가격등록일자"].min().date()
-    max_date = df["가격등록일자"].max().date()
+    try:
+        # 데이터 파일 지문 – 메모리 캐시 키에 넣어 ingest로 파일이 바뀌면 새로 계산되게 함
+        data_version = file_fingerprint()
+        min_date, max_date = load_date_range(data_version)
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
 
     selected_range = st.slider(
         "조회 기간",
-        min_value=min_date,
-        max_value=max_date,
-        value=(min_date, max_date),
+        min_value=min_date.date(),
+        max_value=max_date.date(),
+        value=(min_date.date(), max_date.date()),
         format="YYYY-MM-DD"
     )
 
-    df = df[
-        (df["가격등록일자"] >= pd.to_datetime(selected_range[0])) &
-        (df["가격등록일자"] <= pd.to_datetime(selected_range[1])) &
-        (df["품목명"] == item)
-    ]
-
     st.markdown("###  탐지 민감도")
     window = st.radio("이동평균 기간", [7, 14, 30], index=0)
+    method = st.radio(
+        "탐지 방식",
+        ["평균 ± 2σ", "중앙값 ± 3MAD"],
+        index=0,
+        help="중앙값·MAD(중앙절대편차) 방식은 급등락 값에 밴드가 끌려가지 않습니다."
+    )
 
     st.markdown("###  데이터 필터")
-    df_w = df[df["조사구분명"] == "도매"]
+    try:
+        varieties = load_varieties(data_version, item, selected_range[0], selected_range[1])
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
 
-    p_list = sorted(df_w["품종명"].dropna().unique())
+    p_list = list(varieties)
     sel_p = st.selectbox("품종", p_list)
 
-    g_list = sorted(df_w[df_w["품종명"] == sel_p]["산물등급명"].dropna().unique())
+    g_list = varieties.get(sel_p, [])
     sel_g = st.selectbox("등급", g_list)
 
 # =========================================================
 # 3. 분석 데이터 준비
 # =========================================================
-sub = df_w[(df_w["품종명"] == sel_p) & (df_w["산물등급명"] == sel_g)].copy()
-sub = sub.sort_values("가격등록일자")
+try:
+    sub = detect_anomalies(data_version, item, sel_p, sel_g, selected_range[0], selected_range[1], window, method)
+    seasonal = load_seasonal_index(data_version)
+except ComputeUnavailable:
+    st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+    st.stop()
 
 if len(sub) < window:
     st.error(f"데이터가 너무 적어 이동평균({window}일) 계산 불가.")
     st.stop()
 
-# 이동평균 + 볼린저밴드
-sub["MA"] = sub[PRICE_COL].rolling(window).mean()
-sub["STD"] = sub[PRICE_COL].rolling(window).std()
-sub["Upper"] = sub["MA"] + 2 * sub["STD"]
-sub["Lower"] = sub["MA"] - 2 * sub["STD"]
-
-sub["급등"] = sub[PRICE_COL] > sub["Upper"]
-sub["급락"] = sub[PRICE_COL] < sub["Lower"]
-
 sub["연월"] = sub["가격등록일자"].dt.to_period("M").astype(str)
 
 # =========================================================
@@ -141,6 +166,7 @@ m1, m2, m3, m4 = st.columns(4)
 m1.metric("이동 평균 기간", f"{window}일")
 m2.metric("🔴 급등", f"{sub['급등'].sum()}회")
 m3.metric("🔵 급락", f"{sub['급락'].sum()}회")
+m4.metric("탐지 방식", method)
 
 
 st.markdown("---")
@@ -158,6 +184,15 @@ down_p = base.mark_circle(size=60, color="blue").encode(y=PRICE_COL).transform_f
 
 st.altair_chart((line + ma_line + up_p + down_p).properties(height=380), use_container_width=True)
 
+# =========================================================
+# 5-1. 연도별 겹쳐보기 (같은 날짜 기준 전년 비교)
+# =========================================================
+st.subheader(" 연도별 가격 겹쳐보기")
+
+key = (item, sel_p, sel_g, "도매")
+chart = overlay_chart(seasonal, key, selected_range[0].year, selected_range[1].year, height=330)
+st.altair_chart(chart, use_container_width=True)
+
 # =========================================================
 # 6. 월별 상세 분석 (좌/우 2분할)
 # =========================================================
@@ -0,0 +1,171 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+from analytics import tasks
+from analytics.comovement import SERIES_LEVELS, rolling_correlation, to_returns, top_pairs
+from analytics.disk_cache import file_fingerprint
+from analytics.workers import ComputeUnavailable, run
+
+st.set_page_config(page_title="품목 간 동조성 분석", layout="wide")
+
+# ==========================================
+# 고급 그라데이션 배경 적용 코드
+# ==========================================
+st.markdown("""
+<style>
+.stApp {
+    background: rgb(20,30,48);
+    background: linear-gradient(90deg, rgba(20,30,48,1) 0%, rgba(36,59,85,1) 50%, rgba(28,69,50,1) 100%);
+    background-attachment: fixed;
+}
+
+[data-testid="stSidebar"] {
+    background-color: rgba(20, 30, 40, 0.8);
+}
+
+[data-testid="stMetricValue"], h1, h2, h3 {
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+}
+</style>
+""", unsafe_allow_html=True)
+
+st.title("품목 간 가격 동조성(상관) 분석")
+st.caption("전체 품목의 일별 평균가격이 서로 얼마나 같이 움직이는지 비교합니다.")
+
+
+# ==========================================
+# 데이터 로드 (캐시)
+# ==========================================
+# (날짜 × 시계열) 일별 평균가격 행렬 – 조사구분·단위별로 한 번만 만듦
+@st.cache_data
+def load_price_matrix(data_version, kind, level):
+    return run(tasks.price_matrix, kind, level)
+
+
+# 조회 기간별 상관행렬 + 군집 정렬 순서
+@st.cache_data
+def load_correlation(data_version, kind, level, basis, start, end):
+    return run(tasks.correlation, kind, level, basis, start, end)
+
+
+# ==========================================
+# 사이드바 필터
+# ==========================================
+with st.sidebar:
+    st.header("분석 옵션 설정")
+
+    kind = st.radio("조사 기준", ["도매", "소매"], horizontal=True)
+    level = st.radio("비교 단위", list(SERIES_LEVELS), horizontal=True)
+    basis = st.radio(
+        "상관 기준",
+        ["일간 변화율", "가격 수준"],
+        help="가격 수준으로 비교하면 같은 계절 추세만으로도 상관이 높게 나올 수 있습니다."
+    )
+
+    try:
+        # 데이터 파일 지문 – 메모리 캐시 키에 넣어 ingest로 파일이 바뀌면 새로 계산되게 함
+        data_version = file_fingerprint()
+        matrix = load_price_matrix(data_version, kind, level)
+    except ComputeUnavailable:
+        st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+        st.stop()
+    min_d, max_d = matrix.index.min(), matrix.index.max()
+    dates = st.slider(
+        "조회 기간",
+        min_value=min_d.date(),
+        max_value=max_d.date(),
+        value=(min_d.date(), max_d.date()),
+        format="YYYY-MM-DD"
+    )
+
+try:
+    corr, order = load_correlation(data_version, kind, level, basis, dates[0], dates[1])
+except ComputeUnavailable:
+    st.warning("요청이 몰려 계산이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
+    st.stop()
+
+if corr.empty or corr.isna().all().all():
+    st.error("조회 기간에 상관을 계산할 만큼의 데이터가 없습니다.")
+    st.stop()
+
+# ==========================================
+# 상관 히트맵 (군집 정렬)
+# ==========================================
+st.markdown("#### 상관계수 히트맵")
+
+heat_data = (
+    corr.rename_axis(index="A", columns="B")
+    .stack()
+    .reset_index(name="상관계수")
+)
+
+heat_size = max(400, min(18 * len(order), 1400))
+heatmap = (
+    alt.Chart(heat_data)
+    .mark_rect()
+    .encode(
+        x=alt.X("B:N", sort=order, title="", axis=alt.Axis(labelAngle=-60)),
+        y=alt.Y("A:N", sort=order, title=""),
+        color=alt.Color(
+            "상관계수:Q",
+            scale=alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True)
+        ),
+        tooltip=["A", "B", alt.Tooltip("상관계수:Q", format=".2f")]
+    )
+    .properties(height=heat_size, title="비슷하게 움직이는 품목끼리 가깝게 정렬")
+)
+st.altair_chart(heatmap, use_container_width=True)
+
+# ==========================================
+# 동조성 상위 쌍 + 이동 상관
+# ==========================================
+col1, col2 = st.columns([0.8, 1.2])
+
+with col1:
+    st.markdown("#### 함께 움직이는 상위 조합")
+    pairs = top_pairs(corr, 20)
+    st.dataframe(
+        pairs,
+        hide_index=True,
+        use_container_width=True,
+        column_config={"상관계수": st.column_config.NumberColumn(format="%.3f")}
+    )
+
+with col2:
+    st.markdown("#### 이동 상관계수 추이")
+
+    series = list(corr.index)
+    default_a, default_b = (pairs.iloc[0]["시계열 A"], pairs.iloc[0]["시계열 B"]) if not pairs.empty else (series[0], series[-1])
+
+    c_a, c_b, c_w = st.columns([1, 1, 0.8])
+    with c_a:
+        sel_a = st.selectbox("시계열 A", series, index=series.index(default_a))
+    with c_b:
+        # 같은 시계열끼리는 비교할 수 없으므로 A에서 고른 것은 B 후보에서 제외
+        series_b = [s for s in series if s != sel_a]
+        sel_b = st.selectbox("시계열 B", series_b, index=series_b.index(default_b) if default_b in series_b else 0)
+    with c_w:
+        roll_window = st.radio("기간(일)", [30, 90, 180], index=1, horizontal=True)
+
+    pair_matrix = matrix.loc[pd.to_datetime(dates[0]):pd.to_datetime(dates[1]), [sel_a, sel_b]]
+    if basis == "일간 변화율":
+        pair_matrix = to_returns(pair_matrix)
+
+    roll = rolling_correlation(pair_matrix, sel_a, sel_b, roll_window).reset_index(name="상관계수")
+    roll = roll.dropna()
+
+    if roll.empty:
+        st.info("두 시계열이 함께 관측된 기간이 너무 짧습니다.")
+    else:
+        roll_chart = (
+            alt.Chart(roll)
+            .mark_line(color="#4FC3F7")
+            .encode(
+                x=alt.X("가격등록일자:T", title="날짜"),
+                y=alt.Y("상관계수:Q", scale=alt.Scale(domain=[-1, 1])),
+                tooltip=["가격등록일자:T", alt.Tooltip("상관계수:Q", format=".2f")]
+            )
+            .properties(height=330, title=f"{sel_a} ↔ {sel_b} ({roll_window}일 이동 상관)")
+        )
+        st.altair_chart(roll_chart, use_container_width=True)
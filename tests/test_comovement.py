@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from analytics.comovement import cluster_order, correlation_matrix
+
+
+def test_correlation_matrix_matches_pandas_with_gaps():
+    rng = np.random.default_rng(0)
+    n = 200
+    common = rng.normal(size=n).cumsum()
+    matrix = pd.DataFrame({
+        # 가격 수준 그대로(수천~수만 원) 넣어도 pandas와 같아야 함
+        name: level + scale * (common + rng.normal(scale=noise, size=n))
+        for name, level, scale, noise in [
+            ("양파", 1_500, 40, 0.5), ("대파", 3_000, 90, 1.0),
+            ("배추", 12_000, 300, 3.0), ("사과", 40_000, 500, 10.0),
+        ]
+    })
+    # 무작위 결측 + 겹치는 날이 min_periods보다 적은 쌍(사과 앞 170일 / 배추 뒤 170일 결측)
+    matrix = matrix.mask(rng.random(matrix.shape) < 0.2)
+    matrix.loc[:169, "사과"] = np.nan
+    matrix.loc[30:, "배추"] = np.nan
+    matrix["빈 시계열"] = np.nan
+
+    for min_periods in [1, 10, 25]:
+        expected = matrix.drop(columns="빈 시계열").corr(min_periods=min_periods)
+        pd.testing.assert_frame_equal(correlation_matrix(matrix, min_periods), expected, atol=1e-9)
+
+
+def test_cluster_order_keeps_components_together():
+    labels = ["a1", "b1", "a3", "c", "a2", "b2"]
+    corr = pd.DataFrame(np.eye(len(labels)), index=labels, columns=labels).replace(0.0, np.nan)
+
+    def link(x, y, rho):
+        corr.loc[x, y] = corr.loc[y, x] = rho
+
+    # a1 - a2 - a3 사슬 (a1·a3는 약하게만 연결)
+    link("a1", "a2", 0.9)
+    link("a2", "a3", 0.9)
+    link("a1", "a3", 0.2)
+    link("b1", "b2", 0.8)
+    # 음의 상관은 간선이 아님 → a·b는 별개 요소, c는 고립
+    link("a1", "b1", -0.7)
+    link("a3", "b2", -0.5)
+
+    order = cluster_order(corr)
+    assert sorted(order) == sorted(labels)
+    # 큰 요소부터, 고립된 시계열은 맨 뒤
+    assert set(order[:3]) == {"a1", "a2", "a3"}
+    assert set(order[3:5]) == {"b1", "b2"}
+    assert order[5] == "c"
+    # 요소 안에서는 사슬 순서대로 (방향은 고유벡터 부호에 따라 다름)
+    assert order[:3] in (["a1", "a2", "a3"], ["a3", "a2", "a1"])
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from analytics.price_index import INDEX_COLUMNS, update_price_index
+from analytics.schema import DATE_COL, PRICE_COL
+
+
+def _exports(seed=0):
+    # 2년치 도·소매 3품목, 시장 2곳. 양파는 경계 앞뒤 한 달 동안 관측되지 않음
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-01-01", "2021-12-31", freq="D")
+    rows = [
+        (date, kind, item, market, rng.lognormal(7, 0.2))
+        for date in dates
+        for kind in ["도매", "소매"]
+        for item in ["양파", "감자", "배추"]
+        for market in ["가락", "강서"]
+    ]
+    df = pd.DataFrame(rows, columns=[DATE_COL, "조사구분명", "품목명", "시장명", PRICE_COL])
+    gap = (df["품목명"] == "양파") & df[DATE_COL].between("2021-05-15", "2021-06-15")
+    return df[~gap]
+
+
+def _write(df, path):
+    df[INDEX_COLUMNS + ["시장명"]].to_parquet(path)
+
+
+def _rebuild(df, tmp_path):
+    _write(df, tmp_path / "full.parquet")
+    index, _ = update_price_index(tmp_path / "full.parquet", tmp_path / "full_index.parquet")
+    return index
+
+
+def test_incremental_update_matches_rebuild(tmp_path):
+    df = _exports()
+    data, index_path = tmp_path / "data.parquet", tmp_path / "index.parquet"
+
+    for cut in ["2021-03-31", "2021-06-01", "2021-12-31"]:
+        _write(df[df[DATE_COL] <= cut], data)
+        index, _ = update_price_index(data, index_path)
+
+    pd.testing.assert_frame_equal(index, _rebuild(df, tmp_path))
+
+
+def test_late_rows_for_last_stored_day_are_folded_in(tmp_path):
+    df = _exports(seed=1)
+    data, index_path = tmp_path / "data.parquet", tmp_path / "index.parquet"
+    last_day = pd.Timestamp("2021-06-01")
+
+    # 마지막 날은 강서 시장 보고만 먼저 들어오고, 가락 보고는 다음 내보내기에 들어옴
+    early = df[(df[DATE_COL] < last_day) | ((df[DATE_COL] == last_day) & (df["시장명"] == "강서"))]
+    _write(early, data)
+    update_price_index(data, index_path)
+
+    _write(df[df[DATE_COL] <= last_day], data)
+    index, new_days = update_price_index(data, index_path)
+
+    assert new_days == 0
+    pd.testing.assert_frame_equal(index, _rebuild(df[df[DATE_COL] <= last_day], tmp_path))
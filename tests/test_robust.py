@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from analytics.robust import robust_bands, rolling_mean_abs_dev, rolling_median_mad
+
+
+def _brute_force(values, window, min_periods):
+    median = np.full(len(values), np.nan)
+    mad = np.full(len(values), np.nan)
+    mean_ad = np.full(len(values), np.nan)
+    for i in range(len(values)):
+        win = values[max(0, i - window + 1):i + 1]
+        win = win[~np.isnan(win)]
+        if len(win) >= max(min_periods, 1):
+            median[i] = np.median(win)
+            mad[i] = np.median(np.abs(win - median[i]))
+            mean_ad[i] = np.mean(np.abs(win - median[i]))
+    return median, mad, mean_ad
+
+
+def test_rolling_median_mad_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        n = int(rng.integers(0, 60))
+        window = int(rng.integers(1, 15))
+        min_periods = int(rng.integers(0, window + 1))
+        # 작은 정수 범위로 뽑아 같은 값(MAD = 0)이 자주 나오게 함
+        values = rng.integers(0, 6, n).astype("float64")
+        values[rng.random(n) < 0.2] = np.nan
+
+        median, mad = rolling_median_mad(values, window, min_periods)
+        expected_median, expected_mad, expected_mean_ad = _brute_force(values, window, min_periods)
+
+        np.testing.assert_allclose(median, expected_median, equal_nan=True)
+        np.testing.assert_allclose(mad, expected_mad, equal_nan=True)
+        np.testing.assert_allclose(rolling_mean_abs_dev(values, median, window), expected_mean_ad, equal_nan=True)
+
+
+def test_robust_bands_falls_back_when_mad_is_zero():
+    prices = pd.Series([100.0] * 6 + [110.0] + [100.0] * 10)
+    bands = robust_bands(prices, window=7)
+
+    # 110이 들어 있는 창은 MAD가 0이지만 평균절대편차로 폭을 잡아 밴드가 중앙값에 붙지 않음
+    assert (bands["STD"].iloc[6:13] > 0).all()
+    assert not (prices.iloc[7:13] > bands["Upper"].iloc[7:13]).any()
+    assert not (prices.iloc[7:13] < bands["Lower"].iloc[7:13]).any()
+    # 창 안 가격이 모두 같으면 밴드가 없어 급등락으로 판정하지 않음
+    assert bands["Upper"].iloc[13:].isna().all()